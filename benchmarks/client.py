@@ -0,0 +1,116 @@
+# Measure client throughput against a local mock of the TBA API.
+#
+# Each scenario starts benchmarks/mock_server.py in its own process, so the server does not compete with the
+# client for the GIL or show up in its memory, then reports client calls per second, p50 and p99 call
+# latency, and the peak memory traced while making the calls again with a fresh client.
+#
+# Usage: python benchmarks/client.py [--latency SECONDS] [--repeat N] [--fixtures SNAPSHOT] [scenario ...]
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+# Benchmark the tbapy in this checkout, whether or not a tbapy package is installed.
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tbapy
+
+MOCK_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mock_server.py')
+
+
+def event_reads(tba, events, repeat, **kwargs):
+    return [(lambda event=event: tba.event_matches(event, **kwargs)) for _ in range(repeat) for event in events]
+
+
+def uncached(tba):
+    tba.cache = False
+    return tba
+
+
+# Name: (mock server options, client factory taking a base URL, calls factory taking (client, events, repeat), threads, warm up first).
+SCENARIOS = {
+    'serial': ({}, lambda url: uncached(tbapy.TBA('key')), event_reads, 1, False),
+    'concurrent': ({}, lambda url: uncached(tbapy.TBA('key', workers=16)), event_reads, 16, False),
+    'concurrent-httpx': ({}, lambda url: uncached(tbapy.TBA('key', workers=16, transport=tbapy.HTTPXTransport())), event_reads, 16, False),
+    'cached': ({}, lambda url: tbapy.TBA('key'), event_reads, 1, True),
+    'conditional-304': ({}, lambda url: tbapy.TBA('key'),
+                        lambda tba, events, repeat: event_reads(tba, events, repeat, if_modified_since=datetime(2024, 6, 1, 12)), 1, False),
+    'rate-limited-429': ({'--rate-limit': 4}, lambda url: uncached(tbapy.TBA('key')), event_reads, 1, False),
+    'pagination-serial': ({}, lambda url: uncached(tbapy.TBA('key')),
+                          lambda tba, events, repeat: [tba.teams for _ in range(repeat)], 1, False),
+    'pagination-concurrent': ({}, lambda url: uncached(tbapy.TBA('key')),
+                              lambda tba, events, repeat: [lambda: tba.teams(workers=8) for _ in range(repeat)], 1, False),
+    'models-dict': ({'--large': 4}, lambda url: tbapy.TBA('key'), event_reads, 1, True),
+    'models-compact': ({'--large': 4}, lambda url: tbapy.TBA('key', compact=True), event_reads, 1, True),
+    'models-lazy': ({'--large': 4}, lambda url: tbapy.TBA('key', lazy=True), event_reads, 1, True),
+    'large-responses': ({'--large': 16}, lambda url: uncached(tbapy.TBA('key')), event_reads, 4, False),
+}
+
+
+def start_server(options, latency, fixtures):
+    command = [sys.executable, MOCK_SERVER, '--latency', str(latency)]
+    for option, value in options.items():
+        command += [option, str(value)]
+    if fixtures:
+        command += ['--fixtures', fixtures]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    return server, server.stdout.readline().strip()
+
+
+def run(make_client, make_calls, url, events, repeat, threads, warm, trace):
+    tba = make_client(url)
+    tba.READ_URL_PRE = url
+    if warm:
+        for call in make_calls(tba, events, 1):
+            call()
+    calls = make_calls(tba, events, repeat)
+
+    def timed(call):
+        start = time.perf_counter()
+        call()
+        return time.perf_counter() - start
+
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        latencies = sorted(executor.map(timed, calls))
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return len(calls) / elapsed, latencies[len(latencies) // 2], latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tbapy against a local mock of the TBA API.')
+    parser.add_argument('scenarios', nargs='*', default=list(SCENARIOS), help='Scenarios to run: %s.' % ', '.join(SCENARIOS))
+    parser.add_argument('--latency', type=float, default=0.005, help='Seconds the mock server waits before each response.')
+    parser.add_argument('--repeat', type=int, default=5, help='Times each scenario repeats its reads.')
+    parser.add_argument('--fixtures', help='Snapshot file of recorded payloads to serve instead of synthetic ones.')
+    args = parser.parse_args()
+
+    print('%-22s %10s %10s %10s %12s' % ('scenario', 'calls/s', 'p50 ms', 'p99 ms', 'peak MB'))
+    for name in args.scenarios:
+        options, make_client, make_calls, threads, warm = SCENARIOS[name]
+        server, url = start_server(options, args.latency, args.fixtures)
+        try:
+            events = requests.get(url.replace('/api/v3/', '/_events')).json()
+            rate, p50, p99, _ = run(make_client, make_calls, url, events, args.repeat, threads, warm, False)
+            peak = run(make_client, make_calls, url, events, args.repeat, threads, warm, True)[3]
+        finally:
+            server.terminate()
+            server.wait()
+        print('%-22s %10.1f %10.2f %10.2f %12.1f' % (name, rate, 1000 * p50, 1000 * p99, peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
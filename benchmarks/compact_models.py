@@ -0,0 +1,68 @@
+# Compare memory per object and construction rate of the dict-backed and compact Match models.
+#
+# Usage: python benchmarks/compact_models.py [number of matches]
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+# Benchmark the tbapy in this checkout, whether or not a tbapy package is installed.
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tbapy import models, compact
+
+
+def match_payload(i):
+    return {
+        'key': '2024casj_qm%d' % i, 'comp_level': 'qm', 'set_number': 1, 'match_number': i,
+        'event_key': '2024casj', 'winning_alliance': 'red', 'time': 1711900000 + i, 'actual_time': 1711900000 + i,
+        'predicted_time': 1711900000 + i, 'post_result_time': 1711900000 + i, 'videos': [],
+        'alliances': {color: {'score': i, 'team_keys': ['frc%d' % (i + n) for n in range(3)],
+                              'surrogate_team_keys': [], 'dq_team_keys': []} for color in ('red', 'blue')},
+        'score_breakdown': {color: {'autoPoints': i, 'teleopPoints': i, 'endGamePoints': i, 'foulPoints': 0,
+                                    'totalPoints': 3 * i} for color in ('red', 'blue')},
+    }
+
+
+def construction_rates(models, payload, rounds=15):
+    raws = json.loads(payload)
+    rates = [0] * len(models)
+    # Rates vary a lot between runs on a busy machine, so the models take turns, each round timing every model,
+    # and the best rate of each is reported. As timeit does, the cyclic garbage collector is paused while timing.
+    for _ in range(rounds):
+        for i, model in enumerate(models):
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter()
+            objects = [model(raw) for raw in raws]
+            rates[i] = max(rates[i], len(objects) / (time.perf_counter() - start))
+            gc.enable()
+            del objects
+    return rates
+
+
+def size_per_object(model, payload):
+    raws = json.loads(payload)
+    # Nested values are shared with the decoded payload, so only the models' own allocations are counted.
+    tracemalloc.start()
+    objects = [model(raw) for raw in raws]
+    del raws
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / len(objects)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    payload = json.dumps([match_payload(i) for i in range(count)])
+    print('%d matches' % count)
+    names, classes = ('dict', 'compact'), (models.Match, compact.Match)
+    for name, model, rate in zip(names, classes, construction_rates(classes, payload)):
+        print('%-8s %10.0f objects/s %8.0f bytes/object' % (name, rate, size_per_object(model, payload)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# Measure how long `import tbapy` takes, and check that it does not load the HTTP, async or storage libraries.
+#
+# Runs `python -X importtime -c "import tbapy"` in fresh interpreters and reports the best total and the
+# slowest modules. Exits with status 1 if a heavy module was loaded or the import took longer than --max-ms,
+# so it can guard against regressions in CI.
+#
+# Usage: python benchmarks/import_time.py [--runs N] [--max-ms MILLISECONDS]
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Modules that `import tbapy`, or creating a TBA instance, must not load.
+HEAVY = ('requests', 'cachecontrol', 'urllib3', 'httpx', 'asyncio', 'sqlite3', 'concurrent.futures', 'numpy', 'tbapy.compact')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(statement):
+    """
+    Run a statement in a fresh interpreter with -X importtime.
+
+    :param statement: Python code to run.
+    :return: Tuple of a dictionary of module names to their own import time in microseconds, and the list of modules loaded.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (ROOT, os.environ.get('PYTHONPATH')))))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement + '; import sys; print(" ".join(sys.modules))'],
+                            capture_output=True, text=True, env=env, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line and 'self [us]' not in line:
+            own, cumulative, name = line[len('import time:'):].split('|')
+            times[name.strip()] = (int(own), int(cumulative))
+    return times, result.stdout.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the import time of tbapy.')
+    parser.add_argument('--runs', type=int, default=5, help='Number of fresh interpreters to measure; the best is reported.')
+    parser.add_argument('--max-ms', type=float, default=None, help='Fail if importing takes longer than this.')
+    args = parser.parse_args()
+
+    startup = import_times('pass')[0]
+    best = None
+    for _ in range(args.runs):
+        times, _ = import_times('import tbapy')
+        if best is None or times['tbapy'][1] < best['tbapy'][1]:
+            best = times
+    total = best['tbapy'][1] / 1000
+    print('import tbapy: %.1f ms' % total)
+    print('slowest modules it loads (own time):')
+    loaded = {name: times for name, times in best.items() if name not in startup}
+    for name, (own, _) in sorted(loaded.items(), key=lambda item: -item[1][0])[:10]:
+        print('  %-40s %7.2f ms' % (name, own / 1000))
+
+    failed = False
+    for statement in ('import tbapy', 'import tbapy; tbapy.TBA("key")'):
+        loaded = [module for module in import_times(statement)[1] if module in HEAVY]
+        if loaded:
+            print('%s loaded %s' % (statement, ', '.join(loaded)))
+            failed = True
+    if args.max_ms is not None and total > args.max_ms:
+        print('import took longer than %.1f ms' % args.max_ms)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+# Compare decoding and encoding speed of the installed JSON backends.
+#
+# Usage: python benchmarks/json_backends.py [recorded response files...]
+# Without files, a synthetic event match list with score breakdowns is used.
+
+import json
+import os
+import sys
+import time
+
+# Benchmark the tbapy in this checkout, whether or not a tbapy package is installed.
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tbapy.jsonlib import BACKENDS, get_json_backend
+from compact_models import match_payload
+
+
+def best_time(function, argument, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(argument)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    if len(sys.argv) > 1:
+        payloads = {path: open(path, 'rb').read() for path in sys.argv[1:]}
+    else:
+        payloads = {'synthetic matches': json.dumps([match_payload(i) for i in range(5000)]).encode('utf-8')}
+
+    for name, payload in payloads.items():
+        data = json.loads(payload)
+        print('%s: %.1f MB' % (name, len(payload) / 1e6))
+        for backend_name in BACKENDS:
+            try:
+                backend = get_json_backend(backend_name)
+            except ImportError:
+                print('  %-8s not installed' % backend_name)
+                continue
+            loads = len(payload) / best_time(backend.loads, payload) / 1e6
+            dumps = len(payload) / best_time(backend.dumps, data) / 1e6
+            print('  %-8s loads %7.1f MB/s   dumps %7.1f MB/s' % (backend_name, loads, dumps))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+# Local stand-in for the TBA v3 read API, for benchmarks and tests.
+#
+# Serves recorded payloads from a snapshot file (made with `python -m tbapy snapshot`), or synthetic ones
+# shaped like a season's teams, events and matches, and can inject latency, 429s and large responses.
+# Responses carry Last-Modified, ETag and Cache-Control like TBA's, and conditional requests get 304s.
+# Writes to the trusted API are accepted and recorded.
+#
+# Usage: python benchmarks/mock_server.py [--port PORT] [--fixtures SNAPSHOT] [--latency SECONDS]
+#                                         [--rate-limit N] [--large N] [--max-age SECONDS]
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Read snapshots with the tbapy in this checkout, whether or not a tbapy package is installed.
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LAST_MODIFIED = 'Sat, 01 Jun 2024 12:00:00 GMT'
+PREFIX = '/api/v3/'
+
+
+def synthetic_match(event, number, breakdown_fields=40):
+    alliances = {color: {'score': 50 + (number * (3 if color == 'red' else 5)) % 40,
+                         'team_keys': ['frc%d' % ((number * 7 + slot * 13 + offset) % 40 + 1) for slot in range(3)],
+                         'surrogate_team_keys': [], 'dq_team_keys': []}
+                 for color, offset in (('red', 0), ('blue', 3))}
+    return {
+        'key': '%s_qm%d' % (event, number), 'comp_level': 'qm', 'set_number': 1, 'match_number': number,
+        'event_key': event, 'winning_alliance': 'red', 'time': 1711900000 + 420 * number,
+        'actual_time': 1711900000 + 420 * number, 'predicted_time': 1711900000 + 420 * number,
+        'post_result_time': 1711900000 + 420 * number + 180, 'videos': [{'type': 'youtube', 'key': 'v%d' % number}],
+        'alliances': alliances,
+        'score_breakdown': {color: dict({'autoPoints': number % 20, 'teleopPoints': number % 50, 'foulPoints': 0,
+                                         'totalPoints': alliances[color]['score'], 'rp': number % 4},
+                                        **{'field%d' % i: i * number % 7 for i in range(breakdown_fields)})
+                            for color in ('red', 'blue')},
+    }
+
+
+def synthetic_fixtures(year=2024, events=8, matches=80, team_pages=4, large=1):
+    """
+    Build payloads shaped like a season on TBA.
+
+    :param year: Season of the events.
+    :param events: Number of events, each with matches, teams and rankings.
+    :param matches: Qualification matches per event.
+    :param team_pages: Number of full 500-team pages of teams.
+    :param large: Factor by which to grow each match's score breakdown.
+    :return: Dictionary of API URLs to payloads.
+    """
+    fixtures = {'status': {'current_season': year, 'max_season': year, 'is_datafeed_down': False}}
+    keys = ['%se%d' % (year, event) for event in range(events)]
+    fixtures['events/%d' % year] = [{'key': key, 'name': 'Event %d' % i, 'event_code': key[4:], 'year': year,
+                                     'event_type': 0, 'district': None, 'week': i % 6} for i, key in enumerate(keys)]
+    fixtures['events/%d/keys' % year] = keys
+    for key in keys:
+        fixtures['event/%s' % key] = {'key': key, 'year': year}
+        fixtures['event/%s/matches' % key] = [synthetic_match(key, number, 40 * large) for number in range(1, matches + 1)]
+        teams = sorted({team for match in fixtures['event/%s/matches' % key]
+                        for alliance in match['alliances'].values() for team in alliance['team_keys']})
+        fixtures['event/%s/teams/keys' % key] = teams
+        fixtures['event/%s/rankings' % key] = {'rankings': [{'team_key': team, 'rank': rank + 1, 'matches_played': 12,
+                                                            'record': {'wins': 6, 'losses': 6, 'ties': 0}}
+                                                           for rank, team in enumerate(teams)]}
+    for page in range(team_pages + 1):
+        numbers = range(page * 500, (page + 1) * 500) if page < team_pages else ()
+        fixtures['teams/%d' % page] = [{'key': 'frc%d' % number, 'team_number': number, 'nickname': 'Team %d' % number,
+                                        'city': 'San Jose', 'state_prov': 'California', 'country': 'USA',
+                                        'rookie_year': 2000 + number % 25} for number in numbers]
+        for number in numbers:
+            fixtures['team/frc%d' % number] = fixtures['teams/%d' % page][number - page * 500]
+    return fixtures
+
+
+def snapshot_fixtures(path):
+    """
+    Load recorded payloads from a snapshot file.
+
+    :param path: Path of a snapshot made with `python -m tbapy snapshot`.
+    :return: Dictionary of API URLs to payloads.
+    """
+    from tbapy import Snapshot
+
+    snapshot = Snapshot(path)
+    fixtures = {url: snapshot.get(url) for url in snapshot.urls()}
+    snapshot.close()
+    return fixtures
+
+
+class MockTBA:
+    """
+    Threaded HTTP server answering TBA v3 read requests from fixtures.
+
+    Trusted API writes are answered with 200 and recorded in `posts` as (path, headers, body) tuples.
+    """
+
+    def __init__(self, fixtures, port=0, latency=0, rate_limit=0, max_age=60):
+        """
+        :param fixtures: Dictionary of API URLs to payloads.
+        :param port: Port to listen on; 0 picks a free one.
+        :param latency: Seconds to wait before answering each request.
+        :param rate_limit: Answer every Nth request with 429 Too Many Requests; 0 never does.
+        :param max_age: max-age of the Cache-Control header, in seconds.
+        """
+        self.bodies = {}
+        for url, payload in fixtures.items():
+            body = json.dumps(payload).encode('utf-8')
+            self.bodies[PREFIX + url] = (body, '"%s"' % hashlib.md5(body).hexdigest())
+        # Lets benchmarks find what to request without knowing the fixtures.
+        events = sorted(url.split('/')[1] for url in fixtures if url.startswith('event/') and url.endswith('/matches'))
+        body = json.dumps(events).encode('utf-8')
+        self.bodies['/_events'] = (body, '"events"')
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.max_age = max_age
+        self.requests = 0
+        self.posts = []
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self.server.daemon_threads = True
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d%s' % (self.server.server_port, PREFIX)
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with mock._lock:
+                    mock.requests += 1
+                    limited = mock.rate_limit and mock.requests % mock.rate_limit == 0
+                if mock.latency:
+                    time.sleep(mock.latency)
+                found = mock.bodies.get(self.path)
+                if limited:
+                    self.reply(429, b'', {'Retry-After': '0'})
+                elif found is None:
+                    self.reply(404, b'{"Error": "Not found."}')
+                elif self.headers.get('If-None-Match') == found[1] or self.headers.get('If-Modified-Since') == LAST_MODIFIED:
+                    self.reply(304, b'', {'ETag': found[1]})
+                else:
+                    self.reply(200, found[0], {'ETag': found[1]})
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                with mock._lock:
+                    mock.posts.append((self.path, dict(self.headers), body))
+                self.reply(200, b'{"Success": "Update applied."}')
+
+            def reply(self, status, body, headers={}):
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=UTF-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Last-Modified', LAST_MODIFIED)
+                self.send_header('Cache-Control', 'public, max-age=%d' % mock.max_age)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def start(self):
+        """
+        Serve requests in a background thread.
+
+        :return: Base URL to use as TBA.READ_URL_PRE.
+        """
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.url
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve TBA v3 fixtures locally.')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--fixtures', help='Snapshot file of recorded payloads; synthetic payloads are served if omitted.')
+    parser.add_argument('--latency', type=float, default=0, help='Seconds to wait before each response.')
+    parser.add_argument('--rate-limit', type=int, default=0, help='Answer every Nth request with a 429.')
+    parser.add_argument('--large', type=int, default=1, help='Factor to grow synthetic score breakdowns by.')
+    parser.add_argument('--max-age', type=int, default=60, help='max-age of responses, in seconds.')
+    args = parser.parse_args()
+    fixtures = snapshot_fixtures(args.fixtures) if args.fixtures else synthetic_fixtures(large=args.large)
+    mock = MockTBA(fixtures, args.port, args.latency, args.rate_limit, args.max_age)
+    print(mock.url, flush=True)
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    sys.exit(main())
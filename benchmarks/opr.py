@@ -0,0 +1,66 @@
+# Time local OPR computation over a synthetic full season.
+#
+# Usage: python benchmarks/opr.py [number of events]
+
+import os
+import random
+import sys
+import time
+
+# Benchmark the tbapy in this checkout, whether or not a tbapy package is installed.
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tbapy.analytics import OPRCalculator, oprs
+
+
+def event_matches(event, teams=40, matches=80):
+    keys = ['frc%d' % (event * teams + i) for i in range(teams)]
+    strength = {key: random.uniform(5, 40) for key in keys}
+    payload = []
+    for number in range(1, matches + 1):
+        chosen = random.sample(keys, 6)
+        alliances = {}
+        for color, alliance in (('red', chosen[:3]), ('blue', chosen[3:])):
+            score = round(sum(strength[key] for key in alliance) + random.gauss(0, 5))
+            alliances[color] = {'team_keys': alliance, 'score': score}
+        payload.append({'key': '2024e%d_qm%d' % (event, number), 'comp_level': 'qm', 'match_number': number,
+                        'alliances': alliances,
+                        'score_breakdown': {color: {'autoPoints': alliances[color]['score'] // 3} for color in alliances}})
+    return payload
+
+
+def main():
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    random.seed(1418)
+    season = [event_matches(event) for event in range(events)]
+    matches = sum(len(event) for event in season)
+
+    start = time.perf_counter()
+    for event in season:
+        oprs(event)
+    elapsed = time.perf_counter() - start
+    print('batch:        %d events, %d matches in %.2f s (%.1f ms per event)' % (events, matches, elapsed, 1000 * elapsed / events))
+
+    start = time.perf_counter()
+    for event in season:
+        oprs(event, component='autoPoints')
+    elapsed = time.perf_counter() - start
+    print('component:    %d events in %.2f s' % (events, elapsed))
+
+    # Live updates: solve after every match, incrementally and by recomputing from scratch.
+    event = season[0]
+    start = time.perf_counter()
+    calculator = OPRCalculator()
+    for match in event:
+        calculator.add_matches([match])
+        calculator.solve()
+    incremental = (time.perf_counter() - start) / len(event)
+    start = time.perf_counter()
+    for played in range(1, len(event) + 1):
+        oprs(event[:played])
+    full = (time.perf_counter() - start) / len(event)
+    print('live update:  %.2f ms incremental, %.2f ms full recompute per match' % (1000 * incremental, 1000 * full))
+
+
+if __name__ == '__main__':
+    main()
@@ -11,4 +11,7 @@ setup(name='tbapy',
       license='MIT',
       packages=['tbapy'],
       install_requires=['requests', 'cachecontrol'],
+      extras_require={'async': ['httpx'], 'http2': ['httpx[http2]'], 'fast': ['orjson'], 'export': ['numpy'],
+                      'compression': ['zstandard', 'brotli']},
+      entry_points={'console_scripts': ['tbapy=tbapy.__main__:main']},
       zip_safe=False)
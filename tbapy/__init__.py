@@ -1,3 +1,31 @@
 # tbapy - Python library for getting data from The Blue Alliance.
+#
+# Only the models and exceptions are imported up front. Everything else, along with the HTTP, async and
+# storage libraries it needs, is imported when first accessed, so `import tbapy` stays cheap for short-lived
+# programs that may never make a request.
 
-from .main import *
+import importlib
+
+from .models import *
+from .exceptions import *
+
+# Names importable from tbapy, and the modules that define them.
+_LAZY = {
+    'TBA': 'main', 'Watcher': 'watch', 'AsyncTBA': 'aio', 'SQLiteCache': 'cache', 'RateLimiter': 'ratelimit',
+    'JSONBackend': 'jsonlib', 'get_json_backend': 'jsonlib', 'Snapshot': 'snapshot', 'OfflineTBA': 'snapshot',
+    'CachePolicy': 'policy', 'DEFAULT_POLICIES': 'policy', 'Metrics': 'metrics', 'WriteQueue': 'writes',
+    'Transport': 'transport', 'RequestsTransport': 'transport', 'HTTPXTransport': 'transport', 'MemoryCache': 'cache',
+    'Compressor': 'compression', 'WebhookReceiver': 'webhooks', 'WebhookMessage': 'webhooks',
+}
+
+__all__ = [name for name in globals() if not name.startswith('_') and name != 'importlib'] + list(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    return getattr(importlib.import_module('.' + _LAZY[name], __name__), name)
+
+
+def __dir__():
+    return sorted(__all__)
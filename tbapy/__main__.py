@@ -0,0 +1,71 @@
+# Command line interface: python -m tbapy snapshot --year 2024 --out 2024.db, python -m tbapy sync --out 2024.db
+
+import argparse
+import os
+import sys
+
+from .main import TBA
+from .snapshot import Snapshot, EVENT_RESOURCES
+
+
+def train_dictionary(store, args):
+    if args.dictionary:
+        if store.train_dictionary() is None:
+            print('Too few responses to train a dictionary on.', file=sys.stderr)
+        else:
+            print('Compressed with a trained dictionary: %.1f MB.' % (store.size() / 2 ** 20))
+
+
+def snapshot(args):
+    if not args.key:
+        sys.exit('An API key is required: pass --key or set TBA_AUTH_KEY.')
+    tba = TBA(args.key, workers=args.workers)
+    store = Snapshot(args.out)
+    errors = store.crawl(tba, args.year, resources=args.resources.split(','), workers=args.workers)
+    for resource, key, error in errors:
+        print('%s %s: %s' % (resource, key, error), file=sys.stderr)
+    print('%d responses in %s, %d failed.' % (len(store.urls()), args.out, len(errors)))
+    train_dictionary(store, args)
+    store.close()
+    return 1 if errors else 0
+
+
+def sync(args):
+    if not args.key:
+        sys.exit('An API key is required: pass --key or set TBA_AUTH_KEY.')
+    tba = TBA(args.key, workers=args.workers)
+    store = Snapshot(args.out)
+    result = store.sync(tba, args.year, workers=args.workers)
+    for error in result['errors']:
+        print('%s: %s' % (' '.join(str(part) for part in error[:-1]), error[-1]), file=sys.stderr)
+    print('%d added, %d updated, %d unchanged, %d failed.' % (len(result['added']), len(result['updated']),
+                                                             len(result['unchanged']), len(result['errors'])))
+    train_dictionary(store, args)
+    store.close()
+    return 1 if result['errors'] else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='tbapy', description='Tools for The Blue Alliance API.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    parser_snapshot = commands.add_parser('snapshot', help='Download a season into a snapshot file for offline use.')
+    parser_snapshot.add_argument('--key', default=os.environ.get('TBA_AUTH_KEY'), help='Read API key; defaults to $TBA_AUTH_KEY.')
+    parser_snapshot.add_argument('--year', type=int, required=True, help='Season to download.')
+    parser_snapshot.add_argument('--out', required=True, help='Snapshot file to write; an existing file is resumed.')
+    parser_snapshot.add_argument('--workers', type=int, default=8, help='Number of requests to make at once.')
+    parser_snapshot.add_argument('--resources', default=','.join(EVENT_RESOURCES), help='Comma-separated read methods to call for each event.')
+    parser_snapshot.add_argument('--dictionary', action='store_true', help='Afterwards, compress the responses with a zstd dictionary trained on them.')
+    parser_snapshot.set_defaults(run=snapshot)
+    parser_sync = commands.add_parser('sync', help='Update a snapshot file, downloading only responses that changed.')
+    parser_sync.add_argument('--key', default=os.environ.get('TBA_AUTH_KEY'), help='Read API key; defaults to $TBA_AUTH_KEY.')
+    parser_sync.add_argument('--year', type=int, help='Season to check for new events and other new responses.')
+    parser_sync.add_argument('--out', required=True, help='Snapshot file to update.')
+    parser_sync.add_argument('--workers', type=int, default=8, help='Number of requests to make at once.')
+    parser_sync.add_argument('--dictionary', action='store_true', help='Afterwards, compress the responses with a zstd dictionary trained on them.')
+    parser_sync.set_defaults(run=sync)
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,221 @@
+import asyncio
+import functools
+import time
+from .main import TBA, _batch_args, _batch_error, _batching
+from .compression import accept_encoding
+from .metrics import RequestRecord
+from .ratelimit import RateLimiter
+from .jsonlib import JSONBackend, get_json_backend
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class _Pending(Exception):
+    """Raised by a replayed read method when it needs a response that has not been fetched yet."""
+
+    def __init__(self, url, headers):
+        self.url = url
+        self.headers = headers
+
+
+class _Replay(TBA):
+    """
+    Synchronous stand-in for TBA that serves already fetched responses.
+
+    AsyncTBA runs TBA's own method bodies against this class, so URL building, model wrapping and
+    error detection are shared between the two clients instead of being duplicated.
+    """
+
+    cache = True
+
+    def __init__(self, responses, client):
+        self._responses = responses
+        self.models = client.models
+        self.lazy = client.lazy
+        self.json_backend = client.json_backend
+
+    def _get(self, url):
+        headers = self._read_headers()
+        key = (url, tuple(sorted(headers.items())))
+        if key not in self._responses:
+            raise _Pending(url, headers)
+        return self._handle_response(self._responses[key])
+
+
+class AsyncTBA:
+    """
+    Asynchronous library class.
+
+    Offers every read method of TBA as a coroutine, returning the same model objects. Requires httpx.
+    """
+
+    READ_URL_PRE = TBA.READ_URL_PRE
+
+    def __init__(self, auth_key, max_connections=10, timeout=30, client=None, rate_limiter=None, compact=False, lazy=False, json_backend=None, metrics=None):
+        """
+        Store auth key and connection settings; the HTTP client is created on first use.
+
+        :param auth_key: Your application authorization key, obtainable at https://www.thebluealliance.com/account.
+        :param max_connections: Maximum number of requests to have in flight at once.
+        :param timeout: Request timeout in seconds.
+        :param client: Optional preconfigured httpx.AsyncClient to use instead of creating one.
+        :param rate_limiter: RateLimiter to throttle and retry requests with, which may be shared with other clients. Defaults to retrying without a rate limit.
+        :param compact: Return compact models from tbapy.compact, which use less memory, instead of dictionary-based ones.
+        :param lazy: Return lists of models as LazyLists, which only create each model when it is accessed.
+        :param json_backend: JSONBackend, or name of one ('orjson', 'ujson' or 'json'), to decode data with. Defaults to the fastest one installed.
+        :param metrics: Metrics object to record the latency, size and status of read requests in, which may be shared with other clients.
+        """
+        if httpx is None and client is None:
+            raise ImportError('AsyncTBA requires httpx. Install it with `pip3 install tbapy[async]`.')
+        self.auth_key = auth_key
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.client = client
+        self.rate_limiter = rate_limiter or RateLimiter()
+        if compact:
+            from . import compact as _compact_models
+        self.models = _compact_models if compact else TBA.models
+        self.lazy = lazy
+        self.json_backend = TBA.json_backend if json_backend is None else (
+            json_backend if isinstance(json_backend, JSONBackend) else get_json_backend(json_backend))
+        self._semaphore = None
+        self._flights = {}
+        self.metrics = metrics
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the underlying HTTP client and its connection pool.
+        """
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def _fetch(self, url, headers):
+        """
+        Helper method: GET a response from given URL on TBA's API without decoding it.
+
+        :param url: URL string to get data from.
+        :param headers: Extra headers for this request.
+        :return: httpx Response object.
+        """
+        if self.client is None:
+            self.client = httpx.AsyncClient(headers={'X-TBA-Auth-Key': self.auth_key, 'Accept-Encoding': accept_encoding()},
+                                            limits=httpx.Limits(max_connections=self.max_connections),
+                                            timeout=self.timeout)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_connections)
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            await self.rate_limiter.wait_async()
+            try:
+                async with self._semaphore:
+                    response = await self.client.get(self.READ_URL_PRE + url, headers=headers)
+            except httpx.TransportError:
+                delay = self.rate_limiter.retry_delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self.rate_limiter.retry_delay(attempt, response)
+                if delay is None:
+                    if self.metrics is not None:
+                        self.metrics.observe(RequestRecord(url, response.status_code, time.perf_counter() - start, len(response.content)))
+                    return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _call(self, method, args, kwargs):
+        """
+        Helper method: run a TBA read method, fetching each response it asks for asynchronously.
+
+        :param method: Unbound TBA method to run.
+        :param args: Positional arguments for the method.
+        :param kwargs: Keyword arguments for the method.
+        :return: Whatever the method returns.
+        """
+        responses = {}
+        while True:
+            try:
+                return method(_Replay(responses, self), *args, **kwargs)
+            except _Pending as pending:
+                key = (pending.url, tuple(sorted(pending.headers.items())))
+                # Identical requests made while this one is in flight share its response.
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = self._flights[key] = asyncio.ensure_future(self._fetch(pending.url, pending.headers))
+                    flight.add_done_callback(lambda _, key=key: self._flights.pop(key, None))
+                responses[key] = await asyncio.shield(flight)
+
+    async def many(self, method, keys, **kwargs):
+        """
+        Call a read method for many keys at once, within the client's connection limit.
+
+        A key that fails does not fail the batch; its place in the results holds a TBAErrorList instead.
+
+        :param method: Name of the read method to call, e.g. 'team' or 'team_status'.
+        :param keys: Keys to pass as the method's first argument. Tuples are passed as several arguments.
+        :param kwargs: Keyword arguments passed to every call, e.g. simple=True.
+        :return: List of results in the same order as keys.
+        """
+        if not getattr(getattr(TBA, method, None), 'is_read', False):
+            raise ValueError('%s is not a read method.' % method)
+        call = getattr(self, method)
+
+        async def fetch(key):
+            # gather() runs each call in its own task, with its own copy of the context.
+            _batching.set(True)
+            try:
+                return await call(*_batch_args(key), **kwargs)
+            except Exception as e:
+                return _batch_error(e)
+
+        return await asyncio.gather(*(fetch(key) for key in keys))
+
+    async def teams(self, page=None, year=None, simple=False, keys=False, workers=1, **kwargs):
+        """
+        Get list of teams.
+
+        :param page: Page of teams to view. Each page contains 500 teams.
+        :param year: View teams from a specific year.
+        :param simple: Get only vital data.
+        :param keys: Set to true if you only want the teams' keys rather than full data on them.
+        :param workers: When getting all pages, number of pages to fetch concurrently at a time.
+        :return: List of Team objects or string keys.
+        """
+        if page is not None or kwargs:
+            return await self._call(TBA.teams, (), dict(page=page, year=year, simple=simple, keys=keys, workers=workers, **kwargs))
+        teams = []
+        target = 0
+        while True:
+            window = await asyncio.gather(*(self.teams(page=page, year=year, simple=simple, keys=keys)
+                                            for page in range(target, target + workers)))
+            for page_teams in window:
+                if page_teams:
+                    teams = teams + page_teams
+                else:
+                    return teams
+            target += workers
+
+    team_key = staticmethod(TBA.team_key)
+
+
+def _async_method(method):
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        return await self._call(method, args, kwargs)
+
+    return wrapper
+
+
+for _name, _method in vars(TBA).items():
+    if getattr(_method, 'is_read', False) and _name not in vars(AsyncTBA):
+        setattr(AsyncTBA, _name, _async_method(_method))
@@ -0,0 +1,117 @@
+# Local OPR, DPR and CCWM computation from match data. Requires NumPy.
+#
+# Each played alliance is a row of the alliance x team design matrix A, with a 1 for each of its teams. Rather
+# than storing A, the calculator accumulates the normal equations AᵀA and Aᵀb with scatter-adds over team index
+# arrays, so adding matches only touches the new rows and solving stays a small teams x teams least squares.
+
+import numpy
+
+from .export import _raw_items
+from .models import OPRs
+
+
+class OPRCalculator:
+    """
+    Incrementally computes OPR, DPR and CCWM for a set of matches.
+
+    OPR estimates each team's contribution to its alliance's score, DPR its contribution to the opposing
+    alliance's score, and CCWM its contribution to the winning margin.
+    """
+
+    def __init__(self, component=None, comp_levels=('qm',)):
+        """
+        :param component: What to score: None for the alliance's total score, the name of a score breakdown field such as 'autoPoints', or a function taking a match dictionary and an alliance color and returning a number.
+        :param comp_levels: Levels of matches to include, e.g. ('qm',) for qualifications like TBA or ('sf', 'f') for playoffs. None includes all.
+        """
+        self.component = component
+        self.comp_levels = comp_levels
+        self.teams = []
+        self._indices = {}
+        self._normal = numpy.zeros((0, 0))
+        self._totals = numpy.zeros((0, 2))
+        self.matches = 0
+
+    def _score(self, match, color):
+        if self.component is None:
+            return match['alliances'][color]['score']
+        if callable(self.component):
+            return self.component(match, color)
+        return ((match.get('score_breakdown') or {}).get(color) or {}).get(self.component)
+
+    def add_matches(self, matches):
+        """
+        Add played matches to the calculation.
+
+        Unplayed matches, and matches of levels not being included, are skipped.
+
+        :param matches: List of Match objects or match dictionaries, e.g. from event_matches().
+        """
+        rows = []
+        scores = []
+        for match in _raw_items(matches):
+            if self.comp_levels is not None and match.get('comp_level') not in self.comp_levels:
+                continue
+            alliances = match.get('alliances') or {}
+            if alliances.get('red', {}).get('score') in (None, -1) or alliances.get('blue', {}).get('score') in (None, -1):
+                continue
+            red, blue = self._score(match, 'red'), self._score(match, 'blue')
+            if red is None or blue is None:
+                continue
+            rows.append([self._index(team) for team in alliances['red']['team_keys']])
+            scores.append((red, blue))
+            rows.append([self._index(team) for team in alliances['blue']['team_keys']])
+            scores.append((blue, red))
+            self.matches += 1
+        if not rows:
+            return
+
+        size = len(self.teams)
+        if size > len(self._normal):
+            self._normal = numpy.pad(self._normal, ((0, size - len(self._normal)),) * 2)
+            self._totals = numpy.pad(self._totals, ((0, size - len(self._totals)), (0, 0)))
+        width = max(len(row) for row in rows)
+        teams = numpy.array([row + [-1] * (width - len(row)) for row in rows])
+        scores = numpy.array(scores, dtype=numpy.float64)
+        present = teams >= 0
+        pairs = present[:, :, None] & present[:, None, :]
+        rows_i = numpy.broadcast_to(teams[:, :, None], pairs.shape)[pairs]
+        rows_j = numpy.broadcast_to(teams[:, None, :], pairs.shape)[pairs]
+        numpy.add.at(self._normal, (rows_i, rows_j), 1)
+        numpy.add.at(self._totals, teams[present], numpy.repeat(scores, present.sum(axis=1), axis=0))
+
+    def _index(self, team):
+        index = self._indices.get(team)
+        if index is None:
+            index = self._indices[team] = len(self.teams)
+            self.teams.append(team)
+        return index
+
+    def solve(self):
+        """
+        Solve for the current ratings.
+
+        :return: OPRs object with oprs, dprs and ccwms dictionaries of team keys to ratings, like event_oprs().
+        """
+        if not self.teams:
+            return OPRs({'oprs': {}, 'dprs': {}, 'ccwms': {}})
+        ratings = numpy.linalg.lstsq(self._normal, self._totals, rcond=None)[0]
+        oprs, dprs = ratings[:, 0].tolist(), ratings[:, 1].tolist()
+        return OPRs({
+            'oprs': dict(zip(self.teams, oprs)),
+            'dprs': dict(zip(self.teams, dprs)),
+            'ccwms': {team: opr - dpr for team, opr, dpr in zip(self.teams, oprs, dprs)},
+        })
+
+
+def oprs(matches, component=None, comp_levels=('qm',)):
+    """
+    Compute OPR, DPR and CCWM for a list of matches.
+
+    :param matches: List of Match objects or match dictionaries, e.g. from event_matches().
+    :param component: What to score; see OPRCalculator.
+    :param comp_levels: Levels of matches to include; see OPRCalculator.
+    :return: OPRs object with oprs, dprs and ccwms dictionaries of team keys to ratings.
+    """
+    calculator = OPRCalculator(component, comp_levels)
+    calculator.add_matches(matches)
+    return calculator.solve()
@@ -0,0 +1,289 @@
+import io
+import sqlite3
+import threading
+import time
+import types
+import zlib
+from collections import OrderedDict
+from cachecontrol.cache import BaseCache
+from cachecontrol.serialize import Serializer
+from requests.structures import CaseInsensitiveDict
+from .compression import get_compressor
+
+# Header marking a cached response whose body was stored without its content encoding.
+DECODED_HEADER = 'X-TBApy-Decoded'
+
+
+def _decode_content(body, encoding):
+    """
+    Helper function: undo the content encoding of a response body.
+
+    :param body: Bytes as received.
+    :param encoding: Value of the Content-Encoding header, such as 'gzip' or 'br'.
+    :return: Decoded bytes, or None if the encoding is unknown or the body cannot be decoded.
+    """
+    try:
+        for coding in reversed([coding.strip().lower() for coding in encoding.split(',')]):
+            if coding in ('gzip', 'x-gzip'):
+                body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+            elif coding == 'deflate':
+                try:
+                    body = zlib.decompress(body)
+                except zlib.error:
+                    body = zlib.decompress(body, -zlib.MAX_WBITS)
+            elif coding == 'br':
+                try:
+                    import brotli
+                except ImportError:
+                    import brotlicffi as brotli
+                body = brotli.decompress(body)
+            elif coding != 'identity':
+                return None
+    except Exception:
+        # Also covers brotli not being installed; the body is then stored as received.
+        return None
+    return body
+
+
+class DecodingSerializer(Serializer):
+    """
+    CacheControl serializer storing response bodies decoded from their content encoding. Used by RequestsTransport.
+
+    Responses arrive gzip or Brotli encoded, and bodies stored that way barely compress any further, nor can a
+    dictionary be trained on them. Decoded entries keep the original encoding in an X-TBApy-Decoded header.
+    """
+
+    def dumps(self, request, response, body=None):
+        if body is None:
+            body = response.read(decode_content=False)
+            response._fp = io.BytesIO(body)
+            response.length_remaining = len(body)
+        headers = CaseInsensitiveDict(response.headers)
+        if DECODED_HEADER in headers:
+            # Revalidated entry: a 304 response may have added the Content-Encoding of the body it did not send.
+            if 'Content-Encoding' in headers:
+                del headers['Content-Encoding']
+                response.headers.discard('Content-Encoding')
+                response._decoder = None
+        elif headers.get('Content-Encoding', 'identity') != 'identity':
+            decoded = _decode_content(body, headers['Content-Encoding'])
+            if decoded is not None:
+                headers[DECODED_HEADER] = headers.pop('Content-Encoding')
+                headers['Content-Length'] = str(len(decoded))
+                body = decoded
+        stored = types.SimpleNamespace(headers=headers, status=response.status, version=response.version,
+                                       reason=response.reason, decode_content=response.decode_content)
+        return super().dumps(request, stored, body)
+
+
+class MemoryCache(BaseCache):
+    """
+    HTTP cache backend kept in memory, with responses compressed until they are read. This is the default.
+
+    With zstd, a dictionary is trained on the first train_after responses stored and the responses are compressed
+    again with it, which shrinks similar TBA payloads much further than compressing each on its own.
+    """
+
+    def __init__(self, max_size=None, compression=True, train_after=200):
+        """
+        :param max_size: Maximum total size of stored responses in bytes, after compression. None for no limit.
+        :param compression: True to compress responses with a default Compressor, False to store them as they are, or a Compressor object.
+        :param train_after: Number of responses to train a zstd dictionary on, or 0 to never train one.
+        """
+        self.max_size = max_size
+        self.compressor = get_compressor(compression)
+        self.train_after = train_after
+        self._entries = OrderedDict()
+        self._samples = []
+        self._size = 0
+        self._raw_size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        return entry[0] if self.compressor is None else self.compressor.decompress(entry[0])
+
+    def set(self, key, value, expires=None):
+        stored = value if self.compressor is None else self.compressor.compress(value)
+        with self._lock:
+            self._store(key, stored, len(value))
+            self._evict()
+            train = (self.compressor is not None and self.compressor.codec == 'zstd' and self.compressor.dictionary is None
+                     and len(self._samples) < self.train_after)
+            if train:
+                self._samples.append(value)
+                train = len(self._samples) == self.train_after
+        if train:
+            self._train()
+
+    def delete(self, key):
+        with self._lock:
+            self._store(key, None, 0)
+
+    def _store(self, key, stored, raw_size):
+        """
+        Helper method: replace an entry and update the size totals. Must be called holding the lock.
+
+        :param key: Cache key.
+        :param stored: Stored value, or None to remove the entry.
+        :param raw_size: Size of the value before compression.
+        """
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old[0])
+            self._raw_size -= old[1]
+        if stored is not None:
+            self._entries[key] = (stored, raw_size)
+            self._size += len(stored)
+            self._raw_size += raw_size
+
+    def _evict(self):
+        """
+        Helper method: remove least recently used entries until the cache fits in max_size. Must be called holding the lock.
+        """
+        while self.max_size is not None and self._size > self.max_size and self._entries:
+            self._store(next(iter(self._entries)), None, 0)
+
+    def _train(self):
+        """
+        Helper method: train a dictionary on the sampled responses and compress the stored ones again with it.
+        """
+        samples, self._samples = self._samples, []
+        if self.compressor.train(samples) is None:
+            return
+        with self._lock:
+            # Entries are stored again from least to most recently used, which keeps their order.
+            for key, (stored, raw_size) in list(self._entries.items()):
+                self._store(key, self.compressor.compress(self.compressor.decompress(stored)), raw_size)
+            self._evict()
+
+    def size(self):
+        """
+        Get the total size of stored responses.
+
+        :return: Size in bytes, after compression.
+        """
+        with self._lock:
+            return self._size
+
+    def stats(self):
+        """
+        Get the memory used by the cache.
+
+        :return: Dictionary with the number of entries, the size of stored responses before ('raw_size') and after ('size') compression in bytes, and whether a dictionary was trained.
+        """
+        with self._lock:
+            return {'entries': len(self._entries), 'size': self._size, 'raw_size': self._raw_size,
+                    'dictionary': self.compressor is not None and self.compressor.dictionary is not None}
+
+
+class SQLiteCache(BaseCache):
+    """
+    Persistent HTTP cache backend stored in a SQLite file.
+
+    Several threads and processes may share one file. Entries keep their ETag and Last-Modified validators, so
+    stale ones are revalidated with conditional requests rather than downloaded again. When the stored bodies
+    grow past max_size bytes, the least recently used entries are evicted. Responses are stored compressed; pass a
+    Compressor with a dictionary, e.g. one trained by Snapshot.train_dictionary(), to compress them further.
+    """
+
+    def __init__(self, path, max_size=256 * 1024 * 1024, timeout=30, compression=True):
+        """
+        Open (and create if needed) the cache file.
+
+        :param path: Path of the SQLite file.
+        :param max_size: Maximum total size of stored responses in bytes.
+        :param timeout: Seconds to wait for another process holding the file's lock.
+        :param compression: True to compress responses with a default Compressor, False to store them as they are, or a Compressor object.
+        """
+        self.path = path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.compressor = get_compressor(compression)
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS responses '
+                               '(key TEXT PRIMARY KEY, value BLOB, size INTEGER, accessed REAL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+
+    def _connection(self):
+        """
+        Helper method: get this thread's connection to the cache file.
+
+        :return: sqlite3 Connection.
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(self.path, timeout=self.timeout)
+        return connection
+
+    def get(self, key):
+        with self._connection() as connection:
+            row = connection.execute('SELECT value FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            connection.execute('UPDATE responses SET accessed = ? WHERE key = ?', (time.time(), key))
+        if self.compressor is None:
+            return row[0]
+        try:
+            return self.compressor.decompress(row[0])
+        except self.compressor.errors:
+            # Compressed with a dictionary this cache no longer has; treat it as missing.
+            return None
+
+    def set(self, key, value, expires=None):
+        if self.compressor is not None:
+            value = self.compressor.compress(value)
+        with self._connection() as connection:
+            connection.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)',
+                               (key, value, len(value), time.time()))
+            self._evict(connection)
+
+    def delete(self, key):
+        with self._connection() as connection:
+            connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _evict(self, connection):
+        """
+        Helper method: delete least recently used entries until the cache fits in max_size.
+
+        :param connection: Connection with an open transaction.
+        """
+        excess = connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0] - self.max_size
+        if excess <= 0:
+            return
+        evicted = []
+        for key, size in connection.execute('SELECT key, size FROM responses ORDER BY accessed'):
+            evicted.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany('DELETE FROM responses WHERE key = ?', evicted)
+
+    def size(self):
+        """
+        Get the total size of stored responses.
+
+        :return: Size in bytes.
+        """
+        return self._connection().execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def stats(self):
+        """
+        Get the space used by the cache.
+
+        :return: Dictionary with the number of entries and the size of stored responses in bytes.
+        """
+        entries, size = self._connection().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        return {'entries': entries, 'size': size}
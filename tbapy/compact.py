@@ -0,0 +1,120 @@
+# Compact models: __slots__ classes generated from the fields of TBA's v3 schema.
+#
+# Each object stores one slot per schema field instead of a full dict, which makes large lists of matches,
+# events or teams several times smaller. Fields outside the schema are kept in a side dict, so
+# nothing is lost when TBA adds fields. Nested objects (such as a match's alliances) stay as plain dicts
+# until they are first accessed. Models without a fixed schema are the regular dict-backed classes.
+
+import operator
+
+from .models import (_base_model_class, APIStatus, Alliance, DistrictPoints, Insights, OPRs, Predictions,
+                     Rankings, Status, InsightLeaderboard, InsightNotable)
+
+
+class _compact_model_class:
+    __slots__ = ('_extra',)
+    _fields = ()
+    _nested = {}
+
+    def __getattr__(self, name):
+        extra = object.__getattribute__(self, '_extra')
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError('%s has no attribute %s' % (self.__class__.__name__, name))
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return key in self._fields or (self._extra is not None and key in self._extra)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, self.json())
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.raw() == other.raw()
+
+    def json(self):
+        return repr(self.raw())
+
+    def raw(self):
+        """
+        Get the model as a plain dictionary.
+
+        :return: Dictionary of every schema field (None if TBA did not send it) and any extra fields.
+        """
+        raw = {}
+        for field in self._fields:
+            value = getattr(self, '_' + field if field in self._nested else field)
+            if isinstance(value, list):
+                value = [item.raw() if isinstance(item, (_compact_model_class, _base_model_class)) else item for item in value]
+            elif isinstance(value, (_compact_model_class, _base_model_class)):
+                value = value.raw()
+            raw[field] = value
+        if self._extra is not None:
+            raw.update(self._extra)
+        return raw
+
+
+def _nested_property(slot, model):
+    def get(self):
+        value = getattr(self, slot)
+        if type(value) is dict:
+            value = model(value)
+            setattr(self, slot, value)
+        elif type(value) is list and value and type(value[0]) is dict:
+            value = [model(item) for item in value]
+            setattr(self, slot, value)
+        return value
+
+    return property(get)
+
+
+def _compact_model_class_from_schema(class_name, fields, nested={}):
+    slots = tuple('_' + field if field in nested else field for field in fields)
+    namespace = {'__slots__': slots, '_fields': fields, '_nested': nested}
+    # Generate a straight-line __init__. TBA sends every schema field, null or not, so the usual case fetches them
+    # all with one itemgetter call, and the payload has extra fields exactly when it has more keys than the schema.
+    # Payloads missing fields fall back to one get() per field.
+    source = ['def __init__(self, json={}):',
+              '    try:',
+              '        %s = _getter(json)' % ', '.join('self.' + slot for slot in slots),
+              '        self._extra = None if len(json) == %d else {key: json[key] for key in json.keys() - _field_set}' % len(fields),
+              '    except KeyError:',
+              '        get = json.get']
+    source += ['        self.%s = get(%r)' % (slot, field) for slot, field in zip(slots, fields)]
+    source += ['        self._extra = None if _field_set.issuperset(json) else {key: json[key] for key in json.keys() - _field_set}']
+    exec('\n'.join(source), {'_field_set': frozenset(fields), '_getter': operator.itemgetter(*fields)}, namespace)
+    for field, model in nested.items():
+        namespace[field] = _nested_property('_' + field, model)
+    return type(class_name, (_compact_model_class,), namespace)
+
+
+District = _compact_model_class_from_schema('District', ('abbreviation', 'display_name', 'key', 'year'))
+Team = _compact_model_class_from_schema('Team', (
+    'key', 'team_number', 'nickname', 'name', 'school_name', 'city', 'state_prov', 'country', 'address',
+    'postal_code', 'gmaps_place_id', 'gmaps_url', 'lat', 'lng', 'location_name', 'website', 'rookie_year',
+    'motto', 'home_championship'))
+Event = _compact_model_class_from_schema('Event', (
+    'key', 'name', 'event_code', 'event_type', 'district', 'city', 'state_prov', 'country', 'start_date',
+    'end_date', 'year', 'short_name', 'event_type_string', 'week', 'address', 'postal_code', 'gmaps_place_id',
+    'gmaps_url', 'lat', 'lng', 'location_name', 'timezone', 'website', 'first_event_id', 'first_event_code',
+    'webcasts', 'division_keys', 'parent_event_key', 'playoff_type', 'playoff_type_string'), {'district': District})
+MatchAlliance = _compact_model_class_from_schema('MatchAlliance', ('score', 'team_keys', 'surrogate_team_keys', 'dq_team_keys'))
+MatchAlliances = _compact_model_class_from_schema('MatchAlliances', ('red', 'blue'), {'red': MatchAlliance, 'blue': MatchAlliance})
+Match = _compact_model_class_from_schema('Match', (
+    'key', 'comp_level', 'set_number', 'match_number', 'alliances', 'winning_alliance', 'event_key', 'time',
+    'actual_time', 'predicted_time', 'post_result_time', 'score_breakdown', 'videos'), {'alliances': MatchAlliances})
+AwardRecipient = _compact_model_class_from_schema('AwardRecipient', ('team_key', 'awardee'))
+Award = _compact_model_class_from_schema('Award', ('name', 'award_type', 'event_key', 'recipient_list', 'year'),
+                                         {'recipient_list': AwardRecipient})
+Media = _compact_model_class_from_schema('Media', ('type', 'foreign_key', 'details', 'preferred', 'team_keys', 'direct_url', 'view_url'))
+Profile = _compact_model_class_from_schema('Profile', ('type', 'foreign_key', 'details', 'preferred', 'team_keys', 'direct_url', 'view_url'))
+Robot = _compact_model_class_from_schema('Robot', ('year', 'robot_name', 'key', 'team_key'))
+DistrictRanking = _compact_model_class_from_schema('DistrictRanking', ('team_key', 'rank', 'rookie_bonus', 'point_total', 'event_points'))
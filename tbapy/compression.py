@@ -0,0 +1,140 @@
+# Compression of stored response bodies.
+#
+# TBA responses are large and repetitive, matches with score breakdowns especially, so caches and snapshots store
+# them compressed and only decompress them when they are read. zstd is used when the zstandard package is
+# installed, with a dictionary trained on TBA payloads once one is given or trained; gzip otherwise. Compressed
+# data is recognised by its magic number, so data stored uncompressed, with zlib or with another codec can always
+# be read back.
+
+import functools
+import gzip
+import importlib.util
+import threading
+import zlib
+
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+GZIP_MAGIC = b'\x1f\x8b'
+# First bytes of zlib streams at each compression level, as written by older snapshots.
+ZLIB_HEADERS = (b'\x78\x01', b'\x78\x5e', b'\x78\x9c', b'\x78\xda')
+DICTIONARY_SIZE = 64 * 1024
+
+
+@functools.lru_cache()
+def accept_encoding():
+    """
+    Get the Accept-Encoding header value listing the content encodings responses can be decoded from.
+
+    Brotli is only listed when the brotli or brotlicffi package, which requests and httpx decode it with, is installed.
+
+    :return: String.
+    """
+    if any(importlib.util.find_spec(module) is not None for module in ('brotli', 'brotlicffi')):
+        return 'br, gzip'
+    return 'gzip'
+
+
+class Compressor:
+    """
+    Compresses and decompresses stored bodies. Instances may be shared between threads.
+    """
+
+    def __init__(self, codec='auto', level=None, dictionary=None):
+        """
+        :param codec: 'zstd', 'gzip', or 'auto' to use zstd if the zstandard package is installed and gzip otherwise.
+        :param level: Compression level. Defaults to 3 for zstd and 6 for gzip.
+        :param dictionary: zstd dictionary, as returned by train(), to compress with.
+        """
+        if codec == 'auto':
+            codec = 'zstd' if importlib.util.find_spec('zstandard') is not None else 'gzip'
+        if codec not in ('zstd', 'gzip'):
+            raise ValueError('Unknown codec %r.' % codec)
+        self.codec = codec
+        self.level = level if level is not None else 3 if codec == 'zstd' else 6
+        self.dictionary = dictionary
+        self._local = threading.local()
+
+    def _zstd(self):
+        """
+        Helper method: get this thread's zstd compressor and decompressor for the current dictionary.
+
+        :return: Tuple of zstandard ZstdCompressor and ZstdDecompressor objects.
+        """
+        import zstandard
+        contexts = getattr(self._local, 'contexts', None)
+        if contexts is None or contexts[0] is not self.dictionary:
+            options = {} if self.dictionary is None else {'dict_data': zstandard.ZstdCompressionDict(self.dictionary)}
+            contexts = self._local.contexts = (self.dictionary, zstandard.ZstdCompressor(level=self.level, **options),
+                                               zstandard.ZstdDecompressor(**options))
+        return contexts[1:]
+
+    def compress(self, data):
+        """
+        Compress data. Data that would not get smaller is returned unchanged.
+
+        :param data: Bytes.
+        :return: Bytes.
+        """
+        if self.codec == 'zstd':
+            compressed = self._zstd()[0].compress(data)
+        else:
+            compressed = gzip.compress(data, self.level, mtime=0)
+        return compressed if len(compressed) < len(data) else data
+
+    def decompress(self, data):
+        """
+        Decompress data stored by any compressor, or stored uncompressed.
+
+        :param data: Bytes.
+        :return: Bytes.
+        """
+        if data.startswith(ZSTD_MAGIC):
+            return self._zstd()[1].decompress(data)
+        if data.startswith(GZIP_MAGIC):
+            return gzip.decompress(data)
+        if data[:2] in ZLIB_HEADERS:
+            return zlib.decompress(data)
+        return data
+
+    def train(self, samples, size=DICTIONARY_SIZE):
+        """
+        Train a zstd dictionary on sample bodies and compress with it from now on.
+
+        Data compressed before training can still be decompressed. Nothing is trained when using gzip, or when
+        there are too few samples.
+
+        :param samples: List of uncompressed bodies, ideally a few hundred.
+        :param size: Maximum size of the dictionary in bytes.
+        :return: Dictionary as bytes, or None if none was trained.
+        """
+        if self.codec != 'zstd':
+            return None
+        import zstandard
+        try:
+            dictionary = zstandard.train_dictionary(size, list(samples)).as_bytes()
+        except zstandard.ZstdError:
+            return None
+        self.dictionary = dictionary
+        return dictionary
+
+    @property
+    def errors(self):
+        """
+        Exception types raised when data cannot be decompressed, such as data compressed with another dictionary.
+        """
+        errors = (OSError, EOFError, zlib.error)
+        if self.codec == 'zstd':
+            import zstandard
+            errors += (zstandard.ZstdError,)
+        return errors
+
+
+def get_compressor(compression):
+    """
+    Get the compressor for a compression option.
+
+    :param compression: True for a default Compressor, False or None for no compression, or a Compressor object.
+    :return: Compressor object, or None.
+    """
+    if compression is True:
+        return Compressor()
+    return compression or None
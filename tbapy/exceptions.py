@@ -8,5 +8,11 @@ class TBAErrorList(Exception):
 
 
 class NotModifiedException(Exception):
-    def __init__(self, last_modified):
-        self.last_modified = LastModifiedDate(last_modified)
+    def __init__(self, last_modified, etag=None):
+        self.last_modified = LastModifiedDate(last_modified, etag)
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, retry_in):
+        self.retry_in = retry_in
+        super().__init__('Requests to TBA keep failing; failing fast for another %.1f seconds.' % retry_in)
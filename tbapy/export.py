@@ -0,0 +1,173 @@
+# Columnar export of match, ranking and OPR data for analysis.
+#
+# Each payload is walked once, appending straight into per-column lists; the lists are then turned into a NumPy
+# structured array, an Arrow table or a pandas DataFrame in one step. NumPy, pyarrow and pandas are optional
+# and only imported by the function that needs them.
+
+from .models import LazyList
+
+MATCH_COLUMNS = ('key', 'event_key', 'comp_level', 'set_number', 'match_number', 'time', 'actual_time',
+                 'winning_alliance', 'red1', 'red2', 'red3', 'blue1', 'blue2', 'blue3', 'red_score', 'blue_score')
+
+
+def _raw_items(items):
+    if isinstance(items, LazyList):
+        return items.raw()
+    return [item if isinstance(item, dict) else item.raw() for item in items]
+
+
+def _flatten(prefix, value, row):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten('%s.%s' % (prefix, key), item, row)
+    elif not isinstance(value, list):
+        row[prefix] = value
+
+
+class _Columns:
+    """Column lists being filled row by row, where later rows may add columns."""
+
+    def __init__(self, names=()):
+        self.rows = 0
+        self.columns = {name: [] for name in names}
+
+    def append(self, row):
+        columns = self.columns
+        for name, value in row.items():
+            column = columns.get(name)
+            if column is None:
+                column = columns[name] = [None] * self.rows
+            column.append(value)
+        self.rows += 1
+        for column in columns.values():
+            if len(column) < self.rows:
+                column.append(None)
+
+
+def match_columns(matches, breakdown=True):
+    """
+    Turn matches into columns.
+
+    There are fixed columns for each match's key, event, level, numbers, times, winner, alliance teams
+    (red1 to blue3) and scores, plus one per scalar field of the score breakdown, e.g. red.autoPoints.
+
+    :param matches: List of Match objects or match dictionaries, e.g. from event_matches() or team_matches().
+    :param breakdown: Include score breakdown fields.
+    :return: Dictionary of column names to lists of values, with None where a match lacks a field.
+    """
+    columns = _Columns(MATCH_COLUMNS)
+    for match in _raw_items(matches):
+        alliances = match.get('alliances') or {}
+        red = alliances.get('red') or {}
+        blue = alliances.get('blue') or {}
+        red_teams = (red.get('team_keys') or []) + [None] * 3
+        blue_teams = (blue.get('team_keys') or []) + [None] * 3
+        row = {
+            'key': match.get('key'), 'event_key': match.get('event_key'), 'comp_level': match.get('comp_level'),
+            'set_number': match.get('set_number'), 'match_number': match.get('match_number'),
+            'time': match.get('time'), 'actual_time': match.get('actual_time'),
+            'winning_alliance': match.get('winning_alliance'),
+            'red1': red_teams[0], 'red2': red_teams[1], 'red3': red_teams[2],
+            'blue1': blue_teams[0], 'blue2': blue_teams[1], 'blue3': blue_teams[2],
+            'red_score': red.get('score'), 'blue_score': blue.get('score'),
+        }
+        if breakdown:
+            for color, values in (match.get('score_breakdown') or {}).items():
+                _flatten(color, values, row)
+        columns.append(row)
+    return columns.columns
+
+
+def ranking_columns(rankings):
+    """
+    Turn event rankings into columns.
+
+    There are columns for each team's key, rank, matches played, disqualifications and win-loss-tie record,
+    plus one per sort order and extra stat, named as TBA names them.
+
+    :param rankings: Rankings object or dictionary, as returned by event_rankings().
+    :return: Dictionary of column names to lists of values.
+    """
+    sort_names = [info['name'] for info in rankings.get('sort_order_info') or []]
+    extra_names = [info['name'] for info in rankings.get('extra_stats_info') or []]
+    columns = _Columns(('team_key', 'rank', 'matches_played', 'dq', 'wins', 'losses', 'ties'))
+    for ranking in rankings.get('rankings') or []:
+        record = ranking.get('record') or {}
+        row = {
+            'team_key': ranking.get('team_key'), 'rank': ranking.get('rank'),
+            'matches_played': ranking.get('matches_played'), 'dq': ranking.get('dq'),
+            'wins': record.get('wins'), 'losses': record.get('losses'), 'ties': record.get('ties'),
+        }
+        row.update(zip(sort_names, ranking.get('sort_orders') or []))
+        row.update(zip(extra_names, ranking.get('extra_stats') or []))
+        columns.append(row)
+    return columns.columns
+
+
+def opr_columns(oprs):
+    """
+    Turn event OPRs into columns.
+
+    :param oprs: OPRs object or dictionary, as returned by event_oprs().
+    :return: Dictionary with team_key, opr, dpr and ccwm columns.
+    """
+    teams = sorted(oprs.get('oprs') or {})
+    return {
+        'team_key': teams,
+        'opr': [oprs['oprs'].get(team) for team in teams],
+        'dpr': [(oprs.get('dprs') or {}).get(team) for team in teams],
+        'ccwm': [(oprs.get('ccwms') or {}).get(team) for team in teams],
+    }
+
+
+def to_numpy(columns):
+    """
+    Convert columns to a NumPy structured array.
+
+    Integer columns with missing values become floats with NaN, text columns become fixed-width strings with
+    missing values empty, and columns mixing types become objects.
+
+    :param columns: Dictionary of column names to lists, as returned by match_columns() and the like.
+    :return: numpy structured array with one record per row.
+    """
+    import numpy
+
+    arrays = {}
+    for name, values in columns.items():
+        present = [value for value in values if value is not None]
+        types = {type(value) for value in present}
+        if types <= {int, bool} and len(present) == len(values) and types:
+            arrays[name] = numpy.array(values, dtype=bool if types == {bool} else numpy.int64)
+        elif types <= {int, float}:
+            arrays[name] = numpy.array([numpy.nan if value is None else value for value in values], dtype=numpy.float64)
+        elif types == {str}:
+            arrays[name] = numpy.array(['' if value is None else value for value in values], dtype=str)
+        else:
+            arrays[name] = numpy.array(values, dtype=object)
+    length = len(next(iter(columns.values()), []))
+    array = numpy.empty(length, dtype=[(name, values.dtype) for name, values in arrays.items()])
+    for name, values in arrays.items():
+        array[name] = values
+    return array
+
+
+def to_arrow(columns):
+    """
+    Convert columns to an Arrow table. Requires pyarrow.
+
+    :param columns: Dictionary of column names to lists, as returned by match_columns() and the like.
+    :return: pyarrow Table.
+    """
+    import pyarrow
+    return pyarrow.table(columns)
+
+
+def to_pandas(columns):
+    """
+    Convert columns to a pandas DataFrame. Requires pandas.
+
+    :param columns: Dictionary of column names to lists, as returned by match_columns() and the like.
+    :return: pandas DataFrame.
+    """
+    import pandas
+    return pandas.DataFrame(columns)
@@ -0,0 +1,237 @@
+# In-memory index over fetched data, for questions that would otherwise take many API calls.
+#
+# Matches are stored once by key; everything else is a dict of sets of keys (team -> matches, event -> teams,
+# district -> events and back), plus per-team counters of alliance partners and opponents, so lookups and
+# intersections never scan the stored matches.
+
+import re
+from collections import Counter, defaultdict
+
+from . import models as _dict_models, compact as _compact_models
+from .export import _raw_items
+
+_SNAPSHOT_URL = re.compile(r'^(?:event/(?P<event>[^/]+)/(?P<event_resource>matches|teams)(?:/simple|/keys)?'
+                           r'|district/(?P<district>[^/]+)/events(?:/simple|/keys)?'
+                           r'|events/\d+(?:/simple)?)$')
+
+
+class Index:
+    """
+    Hash indexes of matches, teams, events and districts, fed from API results or a snapshot.
+    """
+
+    def __init__(self, compact=False):
+        """
+        :param compact: Return compact models from tbapy.compact instead of dictionary-based ones.
+        """
+        self.models = _compact_models if compact else _dict_models
+        self._matches = {}
+        self._team_matches = defaultdict(set)
+        self._event_teams = defaultdict(set)
+        self._team_events = defaultdict(set)
+        self._district_events = defaultdict(set)
+        self._event_districts = {}
+        self._partners = defaultdict(Counter)
+        self._opponents = defaultdict(Counter)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, compact=False):
+        """
+        Build an index from every match, event team list and district event list in a snapshot.
+
+        :param snapshot: Snapshot to read.
+        :param compact: Return compact models; see Index.
+        :return: Index object.
+        """
+        index = cls(compact)
+        for url in snapshot.urls():
+            found = _SNAPSHOT_URL.match(url)
+            if found is None:
+                continue
+            raw = snapshot.get(url)
+            # Skip stored nulls, and error responses kept by snapshots made by earlier versions.
+            if not isinstance(raw, list):
+                continue
+            if found['event_resource'] == 'matches':
+                if not url.endswith('/keys'):
+                    index.add_matches(raw)
+            elif found['event_resource'] == 'teams':
+                index.add_event_teams(found['event'], raw)
+            elif found['district'] is not None:
+                index.add_district_events(found['district'], raw)
+            else:
+                index.add_events(raw)
+        return index
+
+    def _link(self, event, team):
+        self._event_teams[event].add(team)
+        self._team_events[team].add(event)
+
+    def add_matches(self, matches):
+        """
+        Index matches. Teams that played in a match are also indexed as attending its event.
+
+        :param matches: List of Match objects or match dictionaries, e.g. from event_matches() or team_matches().
+        """
+        for match in _raw_items(matches):
+            key = match['key']
+            known = key in self._matches
+            self._matches[key] = match
+            if known:
+                continue
+            alliances = [(match.get('alliances') or {}).get(color) or {} for color in ('red', 'blue')]
+            alliances = [alliance.get('team_keys') or [] for alliance in alliances]
+            for teams, others in ((alliances[0], alliances[1]), (alliances[1], alliances[0])):
+                for team in teams:
+                    self._team_matches[team].add(key)
+                    self._link(match.get('event_key') or key.split('_')[0], team)
+                    self._partners[team].update(partner for partner in teams if partner != team)
+                    self._opponents[team].update(others)
+
+    def add_event_teams(self, event, teams):
+        """
+        Index the teams attending an event.
+
+        :param event: Event key.
+        :param teams: List of Team objects, team dictionaries or team keys, as returned by event_teams().
+        """
+        for team in teams:
+            self._link(event, team if isinstance(team, str) else team['key'])
+
+    def add_district_events(self, district, events):
+        """
+        Index the events of a district.
+
+        :param district: District key.
+        :param events: List of Event objects, event dictionaries or event keys, as returned by district_events().
+        """
+        for event in events:
+            event = event if isinstance(event, str) else event['key']
+            self._district_events[district].add(event)
+            self._event_districts[event] = district
+
+    def add_events(self, events):
+        """
+        Index the districts of events.
+
+        :param events: List of Event objects or event dictionaries, e.g. from events().
+        """
+        for event in _raw_items(events):
+            if event.get('district'):
+                self.add_district_events(event['district']['key'], [event['key']])
+
+    def _match_list(self, keys):
+        return [self.models.Match(self._matches[key]) for key in sorted(keys)]
+
+    def team_matches(self, team, year=None, event=None):
+        """
+        Get the indexed matches a team played.
+
+        :param team: Team key.
+        :param year: Only include matches of this year.
+        :param event: Only include matches of this event.
+        :return: List of Match objects, ordered by key.
+        """
+        keys = self._team_matches.get(team, ())
+        if year is not None:
+            keys = [key for key in keys if key.startswith(str(year))]
+        if event is not None:
+            keys = [key for key in keys if key.startswith(event + '_')]
+        return self._match_list(keys)
+
+    def matches_with(self, team, other, relation='any', year=None):
+        """
+        Get the indexed matches two teams both played.
+
+        :param team: Team key.
+        :param other: Key of the other team.
+        :param relation: 'partners' for matches where they were on the same alliance, 'opponents' for matches where they were on opposite alliances, or 'any'.
+        :param year: Only include matches of this year.
+        :return: List of Match objects, ordered by key.
+        """
+        if relation not in ('any', 'partners', 'opponents'):
+            raise ValueError('relation must be any, partners or opponents, not %s.' % relation)
+        keys = self._team_matches.get(team, set()) & self._team_matches.get(other, set())
+        if year is not None:
+            keys = {key for key in keys if key.startswith(str(year))}
+        if relation != 'any':
+            keys = {key for key in keys if (relation == 'partners') == (self._color(key, team) == self._color(key, other))}
+        return self._match_list(keys)
+
+    def _color(self, match, team):
+        alliances = self._matches[match]['alliances']
+        return 'red' if team in (alliances['red'].get('team_keys') or ()) else 'blue'
+
+    def partners(self, team):
+        """
+        Get how often a team played alongside each other team in the indexed matches.
+
+        :param team: Team key.
+        :return: Counter of team keys to numbers of matches.
+        """
+        return Counter(self._partners.get(team, ()))
+
+    def opponents(self, team):
+        """
+        Get how often a team played against each other team in the indexed matches.
+
+        :param team: Team key.
+        :return: Counter of team keys to numbers of matches.
+        """
+        return Counter(self._opponents.get(team, ()))
+
+    def event_teams(self, event):
+        """
+        Get the teams indexed as attending an event.
+
+        :param event: Event key.
+        :return: Sorted list of team keys.
+        """
+        return sorted(self._event_teams.get(event, ()))
+
+    def team_events(self, team, year=None):
+        """
+        Get the events a team is indexed as attending.
+
+        :param team: Team key.
+        :param year: Only include events of this year.
+        :return: Sorted list of event keys.
+        """
+        return sorted(event for event in self._team_events.get(team, ()) if year is None or event.startswith(str(year)))
+
+    def common_teams(self, *events):
+        """
+        Get the teams indexed as attending all of the given events.
+
+        :param events: Event keys.
+        :return: Sorted list of team keys.
+        """
+        teams = [self._event_teams.get(event, set()) for event in events]
+        return sorted(set.intersection(*teams)) if teams else []
+
+    def district_events(self, district):
+        """
+        Get the events indexed as part of a district.
+
+        :param district: District key.
+        :return: Sorted list of event keys.
+        """
+        return sorted(self._district_events.get(district, ()))
+
+    def district_teams(self, district):
+        """
+        Get the teams indexed as attending any event of a district.
+
+        :param district: District key.
+        :return: Sorted list of team keys.
+        """
+        return sorted(set().union(*(self._event_teams.get(event, ()) for event in self._district_events.get(district, ()))))
+
+    def event_district(self, event):
+        """
+        Get the district an event is indexed as part of.
+
+        :param event: Event key.
+        :return: District key, or None.
+        """
+        return self._event_districts.get(event)
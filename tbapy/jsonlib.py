@@ -0,0 +1,72 @@
+# Pluggable JSON backends.
+#
+# Decoding responses is the largest CPU cost of the library after waiting on the network, so the fastest
+# installed backend is used by default. Backends decode raw response bytes directly and encode to str, which
+# is what the trusted API's request signatures are computed over.
+
+import json
+
+
+class JSONBackend:
+    """
+    A JSON implementation: a name and loads/dumps functions.
+    """
+
+    def __init__(self, name, loads, dumps):
+        """
+        :param name: Name of the backend.
+        :param loads: Function decoding bytes or str to Python objects.
+        :param dumps: Function encoding Python objects to str.
+        """
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, self.name)
+
+
+def _orjson():
+    import orjson
+    return JSONBackend('orjson', orjson.loads, lambda data: orjson.dumps(data).decode('utf-8'))
+
+
+def _ujson():
+    import ujson
+    return JSONBackend('ujson', ujson.loads, ujson.dumps)
+
+
+def _json():
+    return JSONBackend('json', json.loads, json.dumps)
+
+
+BACKENDS = {'orjson': _orjson, 'ujson': _ujson, 'json': _json}
+
+
+def get_json_backend(name=None):
+    """
+    Get a JSON backend.
+
+    :param name: 'orjson', 'ujson' or 'json'. If omitted, the first of them that is installed is used.
+    :return: JSONBackend object.
+    """
+    if name is not None:
+        if name not in BACKENDS:
+            raise ValueError('Unknown JSON backend %s; choose from %s.' % (name, ', '.join(BACKENDS)))
+        return BACKENDS[name]()
+    for factory in BACKENDS.values():
+        try:
+            return factory()
+        except ImportError:
+            pass
+
+
+class _DefaultJSONBackend:
+    """Class attribute that finds the default backend when first used, so importing does not load it."""
+
+    backend = None
+
+    def __get__(self, instance, owner):
+        if self.backend is None:
+            self.backend = get_json_backend()
+        return self.backend
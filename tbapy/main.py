@@ -1,12 +1,50 @@
 import functools
-import requests
 import json
-from hashlib import md5
+import codecs
 from .models import *
+from . import models as _dict_models
 from .exceptions import *
-from cachecontrol import CacheControl
+from .watch import Watcher
+from .jsonlib import JSONBackend, get_json_backend, _DefaultJSONBackend
+from .ratelimit import RateLimiter, RETRY_STATUSES
+from .policy import CachePolicy, DEFAULT_POLICIES, endpoint_family
+from .metrics import RequestRecord
+from .transport import RequestsTransport
 from datetime import datetime
 import time
+import threading
+import contextvars
+from collections import OrderedDict
+
+# Options of the read call currently being made, kept per thread and per asyncio task.
+_call_options = contextvars.ContextVar('tbapy_call_options', default={'if_modified_since': None, 'if_none_match': None, 'last_modified': False, 'cache': True})
+# Whether list responses of the read call currently being made are streamed.
+_streaming = contextvars.ContextVar('tbapy_streaming', default=False)
+# Whether the read call currently being made is one of a batch, which reports TBA's error responses as TBAErrorLists.
+_batching = contextvars.ContextVar('tbapy_batching', default=False)
+
+
+class _Flight:
+    """A read request in progress, whose result is shared with identical requests made meanwhile."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def _batch_args(key):
+    return key if isinstance(key, tuple) else (key,)
+
+
+def _batch_error(e):
+    return e if isinstance(e, TBAErrorList) else TBAErrorList([(type(e).__name__, str(e))])
 
 
 class TBA:
@@ -18,11 +56,22 @@ class TBA:
 
     READ_URL_PRE = 'https://www.thebluealliance.com/api/v3/'
     WRITE_URL_PRE = 'https://www.thebluealliance.com/api/trusted/v1/'
-    session = CacheControl(requests.Session())
+    models = _dict_models
+    lazy = False
+    json_backend = _DefaultJSONBackend()
+    STREAM_CHUNK_SIZE = 64 * 1024
+    STREAMABLE = ('team_events', 'team_awards', 'team_matches', 'team_years', 'team_media', 'team_robots', 'team_districts',
+                  'team_profiles', 'events', 'event_teams', 'event_awards', 'event_matches', 'districts', 'district_events',
+                  'district_rankings', 'district_teams', 'district_history', 'district_awards', 'insights_leaderboards',
+                  'insights_notables', 'event_alliances', 'team_status')
     auth_secret = ''
     event_key = ''
+    micro_cache_ttl = 0
+    policies = {}
+    metrics = None
+    MICRO_CACHE_SIZE = 1024
 
-    def __init__(self, auth_key, auth_id='', auth_secret='', event_key=''):
+    def __init__(self, auth_key, auth_id='', auth_secret='', event_key='', workers=8, cache_backend=None, rate_limiter=None, compact=False, lazy=False, json_backend=None, micro_cache_ttl=0, policies=False, metrics=None, transport=None):
         """
         Store auth key so we can reuse it as many times as we make a request.
 
@@ -30,12 +79,58 @@ class TBA:
         :param auth_id: Your event authorization ID, obtainable at https://www.thebluealliance.com/request/apiwrite
         :param auth_secret: Your event authorization secret, obtainable at https://www.thebluealliance.com/request/apiwrite
         :param event_key: The event key that is linked to the ID and secret provided.
-        """
+        :param workers: Maximum number of requests made at once by batch methods such as many(), and size of the connection pool.
+        :param cache_backend: CacheControl cache to store responses in, e.g. SQLiteCache('tba.sqlite'). Defaults to an in-memory cache. Only used by the default transport.
+        :param rate_limiter: RateLimiter to throttle and retry requests with, which may be shared with other clients. Defaults to retrying without a rate limit.
+        :param compact: Return compact models from tbapy.compact, which use less memory, instead of dictionary-based ones.
+        :param lazy: Return lists of models as LazyLists, which only create each model when it is accessed.
+        :param json_backend: JSONBackend, or name of one ('orjson', 'ujson' or 'json'), to decode and encode data with. Defaults to the fastest one installed.
+        :param micro_cache_ttl: Seconds to keep responses in memory and return them without consulting the HTTP cache, for very frequently read resources. 0 disables this.
+        :param policies: True to keep responses in memory according to DEFAULT_POLICIES, or a dictionary of endpoint families ('team', 'event', 'match', 'district', 'insights') to CachePolicy objects, or None to disable a family, overriding the defaults. Endpoints without a policy fall back to micro_cache_ttl.
+        :param metrics: Metrics object to record the latency, size, status, cache use and decode time of read requests in, which may be shared with other clients.
+        :param transport: Transport to send requests with, e.g. HTTPXTransport() for HTTP/2. Defaults to a RequestsTransport, which caches reads with CacheControl.
+        """
+        if compact:
+            from . import compact as _compact_models
+            self.models = _compact_models
+        self.lazy = lazy
+        if json_backend is not None:
+            self.json_backend = json_backend if isinstance(json_backend, JSONBackend) else get_json_backend(json_backend)
+        self.auth_key = auth_key
+        self.auth_id = auth_id
         self.auth_secret = auth_secret
         self.event_key = event_key
-        self.session.headers.update({'X-TBA-Auth-Key': auth_key, 'X-TBA-Auth-Id': auth_id})
-        self._if_modified_since = None
-        self._last_modified = False
+        self.cache = True
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._workers = workers
+        self.transport = transport or RequestsTransport(cache_backend, pool_size=workers)
+        self._cache_counts = {'hits': 0, 'misses': 0, 'revalidations': 0, 'coalesced': 0, 'micro_hits': 0, 'stale_hits': 0, 'refreshes': 0}
+        self._cache_counts_lock = threading.Lock()
+        self.micro_cache_ttl = micro_cache_ttl
+        self.metrics = metrics
+        if policies:
+            self.policies = dict(DEFAULT_POLICIES, **(policies if isinstance(policies, dict) else {}))
+        self._micro_cache = OrderedDict()
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+
+    # The thread pool, the transport's connections and the libraries behind them are created on first use, so that clients which
+    # never make a request, and programs which only import tbapy, do not pay for them.
+
+    @functools.cached_property
+    def executor(self):
+        """
+        Thread pool that batch methods, watchers and background refreshes run requests in.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        return ThreadPoolExecutor(self._workers)
+
+    @property
+    def session(self):
+        """
+        Requests session that the default transport sends reads through the HTTP cache with.
+        """
+        return self.transport.session
 
     def _get(self, url):
         """
@@ -44,23 +139,346 @@ class TBA:
         :param url: URL string to get data from.
         :return: Requested data in JSON format.
         """
+        if _streaming.get():
+            return self._stream(url)
+        if not (self.cache and _call_options.get()['cache']):
+            return self._fetch(url, cached=False)
+
+        policy = self._policy(url)
+        if policy is None:
+            return self._shared_fetch(url)
+
+        with self._flights_lock:
+            entry = self._micro_cache.get(url)
+            if entry is not None:
+                self._micro_cache.move_to_end(url)
+        if entry is None:
+            return self._shared_fetch(url, policy)
+
+        age = time.monotonic() - entry[0]
+        if age < policy.ttl:
+            self._count('micro_hits', url)
+            return self._decode(entry[1])
+        if age < policy.ttl + policy.stale_while_revalidate:
+            self._count('stale_hits', url)
+            with self._flights_lock:
+                refreshing = url in self._flights
+            if not refreshing:
+                self._count('refreshes', url)
+                self.executor.submit(self._refresh, url, policy)
+            return self._decode(entry[1])
+        try:
+            return self._shared_fetch(url, policy)
+        except (TBAErrorList, CircuitOpenError) + self.transport.errors:
+            if age < policy.ttl + policy.stale_if_error:
+                self._count('stale_hits', url)
+                return self._decode(entry[1])
+            raise
+
+    def _policy(self, url):
+        """
+        Helper method: get the policy for keeping a URL's responses in memory.
+
+        :param url: URL string.
+        :return: CachePolicy object, or None if responses are not kept in memory.
+        """
+        family = endpoint_family(url)
+        if self.policies.get(family) is not None:
+            return self.policies[family]
+        if self.micro_cache_ttl:
+            return CachePolicy(self.micro_cache_ttl)
+        return None
+
+    def _refresh(self, url, policy):
+        """
+        Helper method: refresh a URL's response kept in memory, for use in the background.
+
+        :param url: URL string.
+        :param policy: CachePolicy the response is kept under.
+        """
+        try:
+            self._shared_fetch(url, policy)
+        except Exception:
+            # The old response keeps being served until it expires; the next read past that retries.
+            pass
+
+    def _shared_fetch(self, url, policy=None):
+        """
+        Helper method: GET and decode data through the HTTP cache, sharing one request between identical reads made at once.
+
+        The response body, rather than the decoded data, is shared and kept in memory, and every caller decodes
+        its own copy, so that callers modifying what they get back cannot change what others get.
+
+        :param url: URL string to get data from.
+        :param policy: CachePolicy to keep the response in memory under, if any.
+        :return: Requested data in JSON format.
+        """
+        with self._flights_lock:
+            flight = self._flights.get(url)
+            leader = flight is None
+            if leader:
+                flight = self._flights[url] = _Flight()
+        if not leader:
+            self._count('coalesced', url)
+            return self._decode(flight.wait())
+
+        try:
+            raw, flight.result = self._download(url)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[url]
+                if policy is not None and flight.error is None:
+                    self._micro_cache[url] = (time.monotonic(), flight.result)
+                    self._micro_cache.move_to_end(url)
+                    if len(self._micro_cache) > self.MICRO_CACHE_SIZE:
+                        self._micro_cache.popitem(last=False)
+            flight.done.set()
+        return raw
+
+    def _decode(self, body):
+        """
+        Helper method: decode a response body shared from memory or by an identical read, for one caller.
+
+        :param body: Response body bytes.
+        :return: Data in JSON format.
+        """
+        raw = self.json_backend.loads(body)
+        self._detect_errors(raw)
+        return raw
+
+    def _fetch(self, url, cached=True):
+        """
+        Helper method: GET and decode data from given URL on TBA's API.
+
+        :param url: URL string to get data from.
+        :param cached: Whether the response may come from the HTTP cache.
+        :return: Requested data in JSON format.
+        """
+        return self._download(url, cached)[0]
+
+    def _download(self, url, cached=True):
+        """
+        Helper method: GET and decode data from given URL on TBA's API, keeping the response body.
+
+        :param url: URL string to get data from.
+        :param cached: Whether the response may come from the HTTP cache.
+        :return: Tuple of the requested data in JSON format and the response body bytes.
+        """
+        if self.metrics is None:
+            response = self._request(url, cached)
+            self._count_cache_use(response)
+            return self._handle_response(response), response.content
+
+        start = time.perf_counter()
+        response = self._request(url, cached)
+        outcome = self._count_cache_use(response)
+        received = time.perf_counter()
+        try:
+            return self._handle_response(response), response.content
+        finally:
+            self.metrics.observe(RequestRecord(url, response.status_code, received - start, len(response.content),
+                                               time.perf_counter() - received, outcome))
+
+    def _stream(self, url):
+        """
+        Helper method: GET a JSON array from given URL on TBA's API, decoding its items as they arrive.
+
+        The response bypasses the HTTP cache, which would otherwise buffer the whole body.
+
+        :param url: URL string to get data from.
+        :return: Iterator over the array's items in JSON format.
+        """
+        response = self._request(url, cached=False, stream=True)
+        self._check_response(response)
+        return self._iter_json_array(response)
+
+    def _request(self, url, cached=True, stream=False):
+        """
+        Helper method: GET a response from given URL on TBA's API, throttling and retrying as configured.
+
+        :param url: URL string to get data from.
+        :param cached: Whether the response may come from the HTTP cache.
+        :param stream: Whether to return before reading the body.
+        :return: Response object of the transport.
+        """
+        attempt = 0
+        while True:
+            self.rate_limiter.wait()
+            try:
+                response = self.transport.get(self.READ_URL_PRE + url, {'X-TBA-Auth-Key': self.auth_key, **self._read_headers()}, cached, stream)
+            except self.transport.errors:
+                delay = self.rate_limiter.retry_delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self.rate_limiter.retry_delay(attempt, response)
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _count_cache_use(self, response):
+        """
+        Helper method: record whether a response came from the cache, was revalidated or was downloaded.
+
+        :param response: Response object of the transport.
+        :return: 'hits', 'misses' or 'revalidations'.
+        """
+        if not getattr(response, 'from_cache', False):
+            outcome = 'misses'
+        elif 'If-None-Match' in response.request.headers or 'If-Modified-Since' in response.request.headers:
+            outcome = 'revalidations'
+        else:
+            outcome = 'hits'
+        with self._cache_counts_lock:
+            self._cache_counts[outcome] += 1
+        return outcome
+
+    def _count(self, outcome, url):
+        with self._cache_counts_lock:
+            self._cache_counts[outcome] += 1
+        if self.metrics is not None:
+            self.metrics.count(outcome, url)
+
+    def cache_stats(self):
+        """
+        Get counts of how read requests made by this instance were served.
+
+        :return: Dictionary with the number of cache hits, misses, revalidations answered with 304 Not Modified, reads that shared an identical read already in flight (coalesced), reads served fresh from memory by the micro cache or a cache policy (micro_hits), reads served stale from memory (stale_hits), and background refreshes started (refreshes).
+        """
+        with self._cache_counts_lock:
+            return dict(self._cache_counts)
+
+    def invalidate(self, url):
+        """
+        Forget the cached responses of a URL, so that its next read makes a request.
+
+        :param url: API URL relative to the v3 root, e.g. 'event/2024casj/matches'.
+        """
+        with self._flights_lock:
+            self._micro_cache.pop(url, None)
+        self.transport.invalidate(self.READ_URL_PRE + url)
+
+    def patch_cache(self, url, function):
+        """
+        Update the response of a URL kept in memory by micro_cache_ttl or a cache policy, which is then fresh again.
+
+        The HTTP cache's response is forgotten, as it cannot be updated. Nothing is kept if the URL's response was not in memory.
+
+        :param url: API URL relative to the v3 root, e.g. 'event/2024casj/matches'.
+        :param function: Function taking the response data in JSON format and returning updated data, or None to forget the response.
+        """
+        self.transport.invalidate(self.READ_URL_PRE + url)
+        with self._flights_lock:
+            entry = self._micro_cache.get(url)
+            if entry is None:
+                return
+            raw = function(self.json_backend.loads(entry[1]))
+            if raw is None:
+                del self._micro_cache[url]
+            else:
+                self._micro_cache[url] = (time.monotonic(), self.json_backend.dumps(raw).encode('utf-8'))
+
+    def _read_headers(self):
+        """
+        Helper method: build the extra headers for the read request currently being made.
+
+        :return: Dictionary of headers.
+        """
         extra_headers = {}
-        if self._if_modified_since is not None:
-            extra_headers['If-Modified-Since'] = self._if_modified_since
+        options = _call_options.get()
+        if options['if_modified_since'] is not None:
+            extra_headers['If-Modified-Since'] = options['if_modified_since']
+        if options['if_none_match'] is not None:
+            extra_headers['If-None-Match'] = options['if_none_match']
+        return extra_headers
+
+    def _handle_response(self, response):
+        """
+        Helper method: check a read response for modification info and errors, then decode it.
+
+        Shared by every client so that they all interpret TBA's responses the same way.
+
+        :param response: Response object exposing status_code, headers and json().
+        :return: Requested data in JSON format.
+        """
+        self._check_response(response)
+        raw = self.json_backend.loads(response.content)
+        self._detect_errors(raw)
+        return raw
+
+    def _check_response(self, response):
+        """
+        Helper method: check a read response's status and record its modification info.
+
+        :param response: Response object exposing status_code and headers.
+        """
+        if response.status_code in RETRY_STATUSES:
+            raise TBAErrorList([(str(response.status_code), 'TBA could not handle the request.')])
 
-        response = self.session.get(self.READ_URL_PRE + url, headers=extra_headers)
         last_modified = response.headers.get('Last-Modified')
-        
+
         if last_modified is not None:
             if response.status_code == 304:
-                raise NotModifiedException(response.headers['Last-Modified'])
+                raise NotModifiedException(response.headers['Last-Modified'], response.headers.get('ETag'))
 
-            if self._last_modified:
-                self._last_modified = LastModifiedDate(last_modified)
+            options = _call_options.get()
+            if options['last_modified']:
+                options['last_modified'] = LastModifiedDate(last_modified, response.headers.get('ETag'))
 
-        raw = response.json()
-        self._detect_errors(raw)
-        return raw
+    def _iter_json_array(self, response):
+        """
+        Helper method: decode the items of a JSON array response one at a time as its body is read.
+
+        :param response: Response object of the transport, opened with stream=True.
+        :return: Generator of items in JSON format.
+        """
+        decoder = json.JSONDecoder()
+        text = codecs.getincrementaldecoder('utf-8')()
+        buffer = ''
+        position = 0
+        started = False
+        with response:
+            chunks = response.iter_content(self.STREAM_CHUNK_SIZE)
+            while True:
+                chunk = next(chunks, None)
+                finished = chunk is None
+                buffer = buffer[position:] + text.decode(chunk or b'', final=finished)
+                position = 0
+                while True:
+                    while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                        position += 1
+                    if position == len(buffer):
+                        break
+                    if not started:
+                        if buffer[position] != '[':
+                            # Not an array, most likely an error; decode it whole so errors are reported as usual.
+                            raw = json.loads(buffer[position:] + ''.join(text.decode(chunk) for chunk in chunks) + text.decode(b'', final=True))
+                            self._detect_errors(raw)
+                            yield from raw
+                            return
+                        started = True
+                        position += 1
+                        continue
+                    if buffer[position] == ']':
+                        return
+                    try:
+                        item, end = decoder.raw_decode(buffer, position)
+                    except ValueError:
+                        if finished:
+                            raise
+                        break
+                    # A number running to the end of the buffer may continue in the next chunk.
+                    if end == len(buffer) and not finished:
+                        break
+                    yield item
+                    position = end
+                if finished:
+                    raise ValueError('Response ended before its JSON array was closed.')
 
     def _post(self, url, data):
         """
@@ -68,13 +486,15 @@ class TBA:
 
         :param url: URL string to post data to and hash.
         :pararm data: JSON data to post and hash.
-        :return: Requests Response object.
+        :return: Response object of the transport.
 
         """
-        raw = self.session.post(
+        from hashlib import md5
+        raw = self.transport.post(
             self.WRITE_URL_PRE + url % self.event_key, 
-            data=data, 
-            headers={
+            data, 
+            {
+                'X-TBA-Auth-Id': self.auth_id,
                 'X-TBA-Auth-Sig': md5((self.auth_secret + '/api/trusted/v1/' + url % self.event_key + data).encode('utf-8')).hexdigest()
             }
         )
@@ -82,6 +502,20 @@ class TBA:
         self._detect_errors(raw)
         return raw
 
+    def _list(self, model, raw):
+        """
+        Helper method: wrap each item of a list response in a model.
+
+        :param model: Model class to wrap items in.
+        :param raw: List of items in JSON format.
+        :return: Iterator of models when streaming, LazyList if the instance is lazy, otherwise a list of models.
+        """
+        if _streaming.get():
+            return map(model, raw)
+        if self.lazy:
+            return LazyList(raw, model)
+        return [model(item) for item in raw]
+
     def _detect_errors(self, json):
         if not isinstance(json, dict):
             return
@@ -89,46 +523,36 @@ class TBA:
         errors = json.get('Errors')
         if errors is not None:
             raise TBAErrorList([error.popitem() for error in errors])
+        # TBA answers unknown keys and bad requests with a 4xx status and {"Error": message}.
+        if _batching.get() and 'Error' in json:
+            raise TBAErrorList([('Error', json['Error'])])
 
     def _check_modified(func):
         @functools.wraps(func)
-        def wrapper(self, *args, last_modified=False, if_modified_since=None, silent=True, **kwargs):
-            self._if_modified_since = if_modified_since and datetime.strftime(if_modified_since, '%a, %d %b %Y %H:%M:%S GMT')
-            self._last_modified = last_modified
-
-            if last_modified or if_modified_since:
-                self.cache = False
+        def wrapper(self, *args, last_modified=False, if_modified_since=None, if_none_match=None, silent=True, **kwargs):
+            options = {
+                'if_modified_since': if_modified_since and datetime.strftime(if_modified_since, '%a, %d %b %Y %H:%M:%S GMT'),
+                'if_none_match': if_none_match,
+                'last_modified': last_modified,
+                'cache': not (last_modified or if_modified_since or if_none_match),
+            }
+            token = _call_options.set(options)
 
             try:
                 output = func(self, *args, **kwargs)
                 if last_modified:
-                    return output, self._last_modified
+                    return output, options['last_modified']
                 return output
             except NotModifiedException as e:
                 if not silent:
                     raise e from None
                 return e.last_modified
             finally:
-                self.cache = True
+                _call_options.reset(token)
 
+        wrapper.is_read = True
         return wrapper
 
-    @property
-    def cache(self):
-        for adapter in self.session.adapters.values():
-            if 'GET' in adapter.cacheable_methods:
-                return True
-
-        return False
-
-    @cache.setter
-    def cache(self, on):
-        for adapter in self.session.adapters.values():
-            if on:
-                adapter.cacheable_methods = ('GET',)
-            else:
-                adapter.cacheable_methods = ()
-
     @staticmethod
     def team_key(identifier):
         """
@@ -143,6 +567,74 @@ class TBA:
         """
         return identifier if type(identifier) == str else 'frc%s' % identifier
 
+    def many(self, method, keys, **kwargs):
+        """
+        Call a read method for many keys at once, sharing the instance's pool of workers.
+
+        A key that fails does not fail the batch; its place in the results holds a TBAErrorList instead.
+
+        :param method: Name of the read method to call, e.g. 'team' or 'team_status'.
+        :param keys: Keys to pass as the method's first argument. Tuples are passed as several arguments.
+        :param kwargs: Keyword arguments passed to every call, e.g. simple=True.
+        :return: List of results in the same order as keys.
+        """
+        call = self._batch_method(method)
+
+        def fetch(key):
+            token = _batching.set(True)
+            try:
+                return call(*_batch_args(key), **kwargs)
+            except Exception as e:
+                return _batch_error(e)
+            finally:
+                _batching.reset(token)
+
+        return list(self.executor.map(fetch, keys))
+
+    def watch(self, resources, min_interval=5, max_interval=300, backoff=2):
+        """
+        Poll read methods for changes.
+
+        See Watcher for details.
+
+        :param resources: Read method calls to watch, each a tuple of the method name followed by its arguments, e.g. ('event_matches', '2024casj').
+        :param min_interval: Shortest time in seconds between polls of one resource.
+        :param max_interval: Longest time in seconds between polls of one resource.
+        :param backoff: Factor by which a resource's poll interval grows each time it is unchanged.
+        :return: Watcher yielding (resource, new_value) tuples.
+        """
+        return Watcher(self, resources, min_interval, max_interval, backoff)
+
+    def stream(self, method, *args, **kwargs):
+        """
+        Call a read method that returns a list, decoding and yielding its items one at a time as they are downloaded.
+
+        Memory use stays flat however large the response is. Streamed responses bypass the cache.
+
+        :param method: Name of the read method to call, e.g. 'event_matches' or 'team_matches'.
+        :param args: Arguments for the method.
+        :param kwargs: Keyword arguments for the method.
+        :return: Iterator of models, or of keys if keys=True is passed.
+        """
+        if method not in self.STREAMABLE:
+            raise ValueError('%s does not return a list that can be streamed.' % method)
+        token = _streaming.set(True)
+        try:
+            return getattr(self, method)(*args, **kwargs)
+        finally:
+            _streaming.reset(token)
+
+    def _batch_method(self, method):
+        """
+        Helper method: look up a read method by name for batching.
+
+        :param method: Name of the read method.
+        :return: Bound method.
+        """
+        if not getattr(getattr(type(self), method, None), 'is_read', False):
+            raise ValueError('%s is not a read method.' % method)
+        return getattr(self, method)
+
     @_check_modified
     def status(self):
         """
@@ -150,10 +642,10 @@ class TBA:
 
         :return: Data on current status of the TBA API as APIStatus object.
         """
-        return APIStatus(self._get('status'))
+        return self.models.APIStatus(self._get('status'))
 
     @_check_modified
-    def teams(self, page=None, year=None, simple=False, keys=False):
+    def teams(self, page=None, year=None, simple=False, keys=False, workers=1):
         """
         Get list of teams.
 
@@ -161,6 +653,7 @@ class TBA:
         :param year: View teams from a specific year.
         :param simple: Get only vital data.
         :param keys: Set to true if you only want the teams' keys rather than full data on them.
+        :param workers: When getting all pages, number of pages to fetch in parallel at a time.
         :return: List of Team objects or string keys.
         """
         # If the user has requested a specific page, get that page.
@@ -169,24 +662,28 @@ class TBA:
                 if keys:
                     return self._get('teams/%s/%s/keys' % (year, page))
                 else:
-                    return [Team(raw) for raw in self._get('teams/%s/%s%s' % (year, page, '/simple' if simple else ''))]
+                    return self._list(self.models.Team, self._get('teams/%s/%s%s' % (year, page, '/simple' if simple else '')))
             else:
                 if keys:
                     return self._get('teams/%s/keys' % page)
                 else:
-                    return [Team(raw) for raw in self._get('teams/%s%s' % (page, '/simple' if simple else ''))]
+                    return self._list(self.models.Team, self._get('teams/%s%s' % (page, '/simple' if simple else '')))
         # If no page was specified, get all of them and combine.
+        # Pages are fetched in windows of `workers` and combined in page order up to the first empty one.
         else:
+            from concurrent.futures import ThreadPoolExecutor
             teams = []
             target = 0
-            while True:
-                page_teams = self.teams(page=target, year=year, simple=simple, keys=keys)
-                if page_teams:
-                    teams.extend(page_teams)
-                else:
-                    break
-                target += 1
-            return teams
+            with ThreadPoolExecutor(workers) as executor:
+                while True:
+                    window = executor.map(lambda page: self.teams(page=page, year=year, simple=simple, keys=keys),
+                                          range(target, target + workers))
+                    for page_teams in window:
+                        if page_teams:
+                            teams = teams + page_teams
+                        else:
+                            return teams
+                    target += workers
 
     @_check_modified
     def team(self, team, simple=False):
@@ -197,7 +694,7 @@ class TBA:
         :param simple: Get only vital data.
         :return: Team object with data on specified team.
         """
-        return Team(self._get('team/%s%s' % (self.team_key(team), '/simple' if simple else '')))
+        return self.models.Team(self._get('team/%s%s' % (self.team_key(team), '/simple' if simple else '')))
 
     @_check_modified
     def team_events(self, team, year=None, simple=False, keys=False):
@@ -214,12 +711,12 @@ class TBA:
             if keys:
                 return self._get('team/%s/events/%s/keys' % (self.team_key(team), year))
             else:
-                return [Event(raw) for raw in self._get('team/%s/events/%s%s' % (self.team_key(team), year, '/simple' if simple else ''))]
+                return self._list(self.models.Event, self._get('team/%s/events/%s%s' % (self.team_key(team), year, '/simple' if simple else '')))
         else:
             if keys:
                 return self._get('team/%s/events/keys' % self.team_key(team))
             else:
-                return [Event(raw) for raw in self._get('team/%s/events%s' % (self.team_key(team), '/simple' if simple else ''))]
+                return self._list(self.models.Event, self._get('team/%s/events%s' % (self.team_key(team), '/simple' if simple else '')))
 
     @_check_modified
     def team_awards(self, team, year=None, event=None):
@@ -232,12 +729,12 @@ class TBA:
         :return: List of Award objects
         """
         if event:
-            return [Award(raw) for raw in self._get('team/%s/event/%s/awards' % (self.team_key(team), event))]
+            return self._list(self.models.Award, self._get('team/%s/event/%s/awards' % (self.team_key(team), event)))
         else:
             if year:
-                return [Award(raw) for raw in self._get('team/%s/awards/%s' % (self.team_key(team), year))]
+                return self._list(self.models.Award, self._get('team/%s/awards/%s' % (self.team_key(team), year)))
             else:
-                return [Award(raw) for raw in self._get('team/%s/awards' % self.team_key(team))]
+                return self._list(self.models.Award, self._get('team/%s/awards' % self.team_key(team)))
 
     @_check_modified
     def team_matches(self, team, event=None, year=None, simple=False, keys=False):
@@ -255,12 +752,12 @@ class TBA:
             if keys:
                 return self._get('team/%s/event/%s/matches/keys' % (self.team_key(team), event))
             else:
-                return [Match(raw) for raw in self._get('team/%s/event/%s/matches%s' % (self.team_key(team), event, '/simple' if simple else ''))]
+                return self._list(self.models.Match, self._get('team/%s/event/%s/matches%s' % (self.team_key(team), event, '/simple' if simple else '')))
         elif year:
             if keys:
                 return self._get('team/%s/matches/%s/keys' % (self.team_key(team), year))
             else:
-                return [Match(raw) for raw in self._get('team/%s/matches/%s%s' % (self.team_key(team), year, '/simple' if simple else ''))]
+                return self._list(self.models.Match, self._get('team/%s/matches/%s%s' % (self.team_key(team), year, '/simple' if simple else '')))
 
     @_check_modified
     def team_years(self, team):
@@ -282,7 +779,7 @@ class TBA:
         :param tag: Get only media with a given tag.
         :return: List of Media objects.
         """
-        return [Media(raw) for raw in self._get('team/%s/media%s%s' % (self.team_key(team), ('/tag/%s' % tag) if tag else '', ('/%s' % year) if year else ''))]
+        return self._list(self.models.Media, self._get('team/%s/media%s%s' % (self.team_key(team), ('/tag/%s' % tag) if tag else '', ('/%s' % year) if year else '')))
 
     @_check_modified
     def team_robots(self, team):
@@ -292,7 +789,7 @@ class TBA:
         :param team: Key for team whose robots you want data on.
         :return: List of Robot objects
         """
-        return [Robot(raw) for raw in self._get('team/%s/robots' % self.team_key(team))]
+        return self._list(self.models.Robot, self._get('team/%s/robots' % self.team_key(team)))
 
     @_check_modified
     def team_districts(self, team):
@@ -302,7 +799,7 @@ class TBA:
         :param team: Team to get data on.
         :return: List of District objects.
         """
-        return [District(raw) for raw in self._get('team/%s/districts' % self.team_key(team))]
+        return self._list(self.models.District, self._get('team/%s/districts' % self.team_key(team)))
 
     @_check_modified
     def team_profiles(self, team):
@@ -312,7 +809,7 @@ class TBA:
         :param team: Team to get data on.
         :return: List of Profile objects.
         """
-        return [Profile(raw) for raw in self._get('team/%s/social_media' % self.team_key(team))]
+        return self._list(self.models.Profile, self._get('team/%s/social_media' % self.team_key(team)))
 
     @_check_modified
     def team_status(self, team=None, event=None, year=None):
@@ -326,11 +823,13 @@ class TBA:
         """
         if event:
             if team:
-                return Status(self._get('team/%s/event/%s/status' % (self.team_key(team), event)))
-            return [Status(raw) for raw in self._get('event/%s/teams/statuses' % (event))]
+                if _streaming.get():
+                    raise ValueError('The status of a team at one event is not a list that can be streamed.')
+                return self.models.Status(self._get('team/%s/event/%s/status' % (self.team_key(team), event)))
+            return self._list(self.models.Status, self._get('event/%s/teams/statuses' % (event)))
         if year:
             if team:
-                return [Status(raw) for raw in self._get('team/%s/events/%s/statuses' % (self.team_key(team), year))]
+                return self._list(self.models.Status, self._get('team/%s/events/%s/statuses' % (self.team_key(team), year)))
             raise ValueError('Team must be specified if year is specified.')
         raise ValueError('Must specify either event or year.')
 
@@ -348,7 +847,7 @@ class TBA:
         if keys:
             return self._get('events/%s/keys' % year)
         else:
-            return [Event(raw) for raw in self._get('events/%s%s' % (year, '/simple' if simple else ''))]
+            return self._list(self.models.Event, self._get('events/%s%s' % (year, '/simple' if simple else '')))
 
     @_check_modified
     def event(self, event, simple=False):
@@ -361,7 +860,7 @@ class TBA:
         :param simple: Get only vital data.
         :return: A single Event object.
         """
-        return Event(self._get('event/%s%s' % (event, '/simple' if simple else '')))
+        return self.models.Event(self._get('event/%s%s' % (event, '/simple' if simple else '')))
 
     @_check_modified
     def event_alliances(self, event):
@@ -371,7 +870,7 @@ class TBA:
         :param event: Key of event to get data on.
         :return: List of Alliance objects.
         """
-        return [Alliance(raw) for raw in self._get('event/%s/alliances' % event)]
+        return self._list(self.models.Alliance, self._get('event/%s/alliances' % event))
 
     @_check_modified
     def event_district_points(self, event):
@@ -381,7 +880,7 @@ class TBA:
         :param event: Key of event to get data on.
         :return: Single DistrictPoints object.
         """
-        return DistrictPoints(self._get('event/%s/district_points' % event))
+        return self.models.DistrictPoints(self._get('event/%s/district_points' % event))
 
     @_check_modified
     def event_insights(self, event):
@@ -391,7 +890,7 @@ class TBA:
         :param event: Key of event to get data on.
         :return: Single Insights object.
         """
-        return Insights(self._get('event/%s/insights' % event))
+        return self.models.Insights(self._get('event/%s/insights' % event))
 
     @_check_modified
     def event_oprs(self, event):
@@ -401,7 +900,7 @@ class TBA:
         :param event: Key of event to get data on.
         :return: Single OPRs object.
         """
-        return OPRs(self._get('event/%s/oprs' % event))
+        return self.models.OPRs(self._get('event/%s/oprs' % event))
 
     @_check_modified
     def event_predictions(self, event):
@@ -411,7 +910,7 @@ class TBA:
         :param event: Key of event to get data on.
         :return: Single Predictions object.
         """
-        return Predictions(self._get('event/%s/predictions' % event))
+        return self.models.Predictions(self._get('event/%s/predictions' % event))
 
     @_check_modified
     def event_rankings(self, event):
@@ -421,7 +920,7 @@ class TBA:
         :param event: Key of event to get data on.
         :return: Single Rankings object.
         """
-        return Rankings(self._get('event/%s/rankings' % event))
+        return self.models.Rankings(self._get('event/%s/rankings' % event))
 
     @_check_modified
     def event_teams(self, event, simple=False, keys=False):
@@ -436,7 +935,7 @@ class TBA:
         if keys:
             return self._get('event/%s/teams/keys' % event)
         else:
-            return [Team(raw) for raw in self._get('event/%s/teams%s' % (event, '/simple' if simple else ''))]
+            return self._list(self.models.Team, self._get('event/%s/teams%s' % (event, '/simple' if simple else '')))
 
     @_check_modified
     def event_awards(self, event):
@@ -446,7 +945,7 @@ class TBA:
         :param event: Event key to get data on.
         :return: List of Award objects.
         """
-        return [Award(raw) for raw in self._get('event/%s/awards' % event)]
+        return self._list(self.models.Award, self._get('event/%s/awards' % event))
 
     @_check_modified
     def event_matches(self, event, simple=False, keys=False):
@@ -461,7 +960,7 @@ class TBA:
         if keys:
             return self._get('event/%s/matches/keys' % event)
         else:
-            return [Match(raw) for raw in self._get('event/%s/matches%s' % (event, '/simple' if simple else ''))]
+            return self._list(self.models.Match, self._get('event/%s/matches%s' % (event, '/simple' if simple else '')))
 
     @_check_modified
     def match(self, key=None, year=None, event=None, type='qm', number=None, round=None, simple=False):
@@ -480,9 +979,9 @@ class TBA:
         :return: A single Match object.
         """
         if key:
-            return Match(self._get('match/%s%s' % (key, '/simple' if simple else '')))
+            return self.models.Match(self._get('match/%s%s' % (key, '/simple' if simple else '')))
         else:
-            return Match(self._get('match/{year}{event}_{type}{number}{round}{simple}'.format(year=year if not event[0].isdigit() else '',
+            return self.models.Match(self._get('match/{year}{event}_{type}{number}{round}{simple}'.format(year=year if not event[0].isdigit() else '',
                                                                                               event=event,
                                                                                               type=type,
                                                                                               number=number,
@@ -497,7 +996,7 @@ class TBA:
         :param year: Year from which you want to get active districts.
         :return: A list of District objects.
         """
-        return [District(raw) for raw in self._get('districts/%s' % year)]
+        return self._list(self.models.District, self._get('districts/%s' % year))
 
     @_check_modified
     def district_events(self, district, simple=False, keys=False):
@@ -512,7 +1011,7 @@ class TBA:
         if keys:
             return self._get('district/%s/events/keys' % district)
         else:
-            return [Event(raw) for raw in self._get('district/%s/events%s' % (district, '/simple' if simple else ''))]
+            return self._list(self.models.Event, self._get('district/%s/events%s' % (district, '/simple' if simple else '')))
 
     @_check_modified
     def district_rankings(self, district):
@@ -522,7 +1021,7 @@ class TBA:
         :param district: Key of district to get rankings of.
         :return: List of DistrictRanking objects.
         """
-        return [DistrictRanking(raw) for raw in self._get('district/%s/rankings' % district)]
+        return self._list(self.models.DistrictRanking, self._get('district/%s/rankings' % district))
 
     @_check_modified
     def district_teams(self, district, simple=False, keys=False):
@@ -537,7 +1036,7 @@ class TBA:
         if keys:
             return self._get('district/%s/teams/keys' % district)
         else:
-            return [Team(raw) for raw in self._get('district/%s/teams' % district)]
+            return self._list(self.models.Team, self._get('district/%s/teams' % district))
 
     @_check_modified
     def district_history(self, abbreviation):
@@ -547,7 +1046,7 @@ class TBA:
         :param district: Abbreviation of district to get rankings of, e.g. 'ne' or 'fim'.
         :return: List of District objects.
         """
-        return [District(raw) for raw in self._get('district/%s/history' % abbreviation)]
+        return self._list(self.models.District, self._get('district/%s/history' % abbreviation))
 
     @_check_modified
     def district_awards(self, district):
@@ -557,7 +1056,7 @@ class TBA:
         :param district: District key to get awards from.
         :return: List of Award objects.
         """
-        return [Award(raw) for raw in self._get('district/%s/awards' % district)]
+        return self._list(self.models.Award, self._get('district/%s/awards' % district))
 
     @_check_modified
     def insights_leaderboards(self, year):
@@ -567,7 +1066,7 @@ class TBA:
         :param year: Year to get leaderboards insights from.
         :return: List of InsightLeaderboard objects.
         """
-        return [InsightLeaderboard(raw) for raw in self._get('insights/leaderboards/%s' % year)]
+        return self._list(self.models.InsightLeaderboard, self._get('insights/leaderboards/%s' % year))
     
     @_check_modified
     def insights_notables(self, year):
@@ -577,7 +1076,7 @@ class TBA:
         :param year: Year to get notable insights from.
         :return: List of InsightNotable objects.
         """
-        return [InsightNotable(raw) for raw in self._get('insights/notables/%s' % year)]
+        return self._list(self.models.InsightNotable, self._get('insights/notables/%s' % year))
 
     def update_trusted(self, auth_id, auth_secret, event_key):
         """
@@ -587,7 +1086,7 @@ class TBA:
         :param auth_secret: Your event authorization secret, obtainable at https://www.thebluealliance.com/request/apiwrite
         :param event_key: The event key that is linked to the ID and secret provided.
         """
-        self.session.headers.update({'X-TBA-Auth-Id': auth_id})
+        self.auth_id = auth_id
         self.auth_secret = auth_secret
         self.event_key = event_key
 
@@ -597,7 +1096,7 @@ class TBA:
 
         :param data: Dictionary of data to update the event with.
         """
-        return self._post('event/%s/info/update', json.dumps(data))
+        return self._post('event/%s/info/update', self.json_backend.dumps(data))
 
     def update_event_alliances(self, data):
         """
@@ -605,7 +1104,7 @@ class TBA:
 
         :param data: List of lists of alliances in frc#### string format.
         """
-        return self._post('event/%s/alliance_selections/update', json.dumps(data))
+        return self._post('event/%s/alliance_selections/update', self.json_backend.dumps(data))
 
     def update_event_awards(self, data):
         """
@@ -613,7 +1112,7 @@ class TBA:
 
         :param data: List of Dictionaries of award winners. Each dictionary should have a name_str for the award name, team_key in frc#### string format, and the awardee for any awards given to individuals. The last two can be null
         """
-        return self._post('event/%s/awards/update', json.dumps(data))
+        return self._post('event/%s/awards/update', self.json_backend.dumps(data))
 
     def update_event_matches(self, data):
         """
@@ -621,7 +1120,7 @@ class TBA:
 
         :param data: List of Dictionaries. More info about the match data can be found in the API docs.
         """
-        return self._post('event/%s/matches/update', json.dumps(data))
+        return self._post('event/%s/matches/update', self.json_backend.dumps(data))
 
     def delete_event_matches(self, data=None):
         """
@@ -629,7 +1128,7 @@ class TBA:
 
         :param data: List of match keys to delete, can be ommited if you would like to delete all matches.
         """
-        return self._post('event/%s/matches/delete_all' if data is None else 'event/%s/matches/delete', json.dumps(self.event_key) if data is None else json.dumps(data))
+        return self._post('event/%s/matches/delete_all' if data is None else 'event/%s/matches/delete', self.json_backend.dumps(self.event_key) if data is None else self.json_backend.dumps(data))
 
     def update_event_rankings(self, data):
         """
@@ -637,7 +1136,7 @@ class TBA:
 
         :param data: Dictionary of breakdowns and rankings. Rankings are a list of dictionaries.
         """
-        return self._post('event/%s/rankings/update', json.dumps(data))
+        return self._post('event/%s/rankings/update', self.json_backend.dumps(data))
 
     def update_event_team_list(self, data):
         """
@@ -645,7 +1144,7 @@ class TBA:
 
         :param data: a list of team keys in frc#### string format.
         """
-        return self._post('event/%s/team_list/update', json.dumps(data))
+        return self._post('event/%s/team_list/update', self.json_backend.dumps(data))
 
     def add_match_videos(self, data):
         """
@@ -653,7 +1152,7 @@ class TBA:
 
         :param data: Dictionary of partial match keys to youtube video ids.
         """
-        return self._post('event/%s/match_videos/add', json.dumps(data))
+        return self._post('event/%s/match_videos/add', self.json_backend.dumps(data))
 
     def add_event_videos(self, data):
         """
@@ -661,4 +1160,4 @@ class TBA:
 
         :param data: List of youtube video ids.
         """
-        return self._post('event/%s/media/add', json.dumps(data))
+        return self._post('event/%s/media/add', self.json_backend.dumps(data))
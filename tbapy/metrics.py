@@ -0,0 +1,238 @@
+# Instrumentation of read requests.
+#
+# Clients only touch this module when given a Metrics object, so there is no cost when instrumentation is
+# off. Each completed request becomes a RequestRecord, which is aggregated per endpoint template (the URL
+# with its keys, years and pages replaced by placeholders) and passed to any hooks. Latency, decode time
+# and response sizes go into fixed-bucket histograms, which export as Prometheus text.
+
+import bisect
+import re
+import threading
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+_KEY_SEGMENTS = {'team': '{team_key}', 'event': '{event_key}', 'district': '{district_key}', 'match': '{match_key}'}
+_NUMBER = re.compile(r'^\d+$')
+
+
+def endpoint_template(url):
+    """
+    Get the endpoint template of an API URL, which metrics are grouped by.
+
+    :param url: API URL relative to the v3 root, e.g. 'team/frc254/matches/2024'.
+    :return: Template such as 'team/{team_key}/matches/{year}'.
+    """
+    parts = url.split('/')
+    for i in range(1, len(parts)):
+        previous = parts[i - 1]
+        if previous in _KEY_SEGMENTS and (i == 1 or previous == 'event'):
+            parts[i] = _KEY_SEGMENTS[previous]
+        elif _NUMBER.match(parts[i]):
+            parts[i] = '{year}' if len(parts[i]) == 4 else '{page}'
+    return '/'.join(parts)
+
+
+class RequestRecord:
+    """
+    Measurements of one completed read request.
+    """
+
+    def __init__(self, url, status, seconds, size, decode_seconds=None, cache=None):
+        """
+        :param url: API URL relative to the v3 root.
+        :param status: HTTP status code.
+        :param seconds: Time from sending the request to receiving the whole response, including retries.
+        :param size: Size of the response body in bytes.
+        :param decode_seconds: Time spent checking and decoding the response, or None if it was not measured.
+        :param cache: How the HTTP cache served the request: 'hits', 'misses' or 'revalidations', or None if unknown.
+        """
+        self.url = url
+        self.template = endpoint_template(url)
+        self.status = status
+        self.seconds = seconds
+        self.size = size
+        self.decode_seconds = decode_seconds
+        self.cache = cache
+
+    def __repr__(self):
+        return '%s(%s %s %.3fs %d bytes)' % (self.__class__.__name__, self.url, self.status, self.seconds, self.size)
+
+
+class Histogram:
+    """
+    Counts of observations falling into fixed buckets, plus their sum.
+    """
+
+    def __init__(self, buckets):
+        """
+        :param buckets: Ascending upper bounds of the buckets; a final unbounded bucket is added.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """
+        Estimate a quantile as the upper bound of the bucket containing it.
+
+        :param q: Quantile between 0 and 1, e.g. 0.99.
+        :return: Upper bound in the histogram's units, infinity if it falls in the last bucket, or None if empty.
+        """
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+
+
+class _EndpointMetrics:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.decode = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.statuses = {}
+        self.cache = {}
+
+
+class Metrics:
+    """
+    Collects metrics of read requests, for one or more clients.
+
+    Pass it to TBA or AsyncTBA as `metrics`. Hooks are called with a RequestRecord after each request and
+    with (outcome, url) for reads served without a request.
+    """
+
+    def __init__(self):
+        self.hooks = []
+        self.cache_hooks = []
+        self._endpoints = {}
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        """
+        Call a function after every completed request.
+
+        :param hook: Function taking a RequestRecord.
+        """
+        self.hooks.append(hook)
+
+    def add_cache_hook(self, hook):
+        """
+        Call a function whenever a read is served from memory, coalesced or refreshed.
+
+        :param hook: Function taking an outcome such as 'micro_hits', 'stale_hits', 'coalesced' or 'refreshes', and the API URL.
+        """
+        self.cache_hooks.append(hook)
+
+    def observe(self, record):
+        """
+        Record a completed request.
+
+        :param record: RequestRecord.
+        """
+        with self._lock:
+            endpoint = self._endpoints.get(record.template)
+            if endpoint is None:
+                endpoint = self._endpoints[record.template] = _EndpointMetrics()
+            endpoint.latency.observe(record.seconds)
+            endpoint.size.observe(record.size)
+            if record.decode_seconds is not None:
+                endpoint.decode.observe(record.decode_seconds)
+            endpoint.statuses[record.status] = endpoint.statuses.get(record.status, 0) + 1
+            if record.cache is not None:
+                endpoint.cache[record.cache] = endpoint.cache.get(record.cache, 0) + 1
+        for hook in self.hooks:
+            hook(record)
+
+    def count(self, outcome, url):
+        """
+        Record a read served without a request of its own.
+
+        :param outcome: 'micro_hits', 'stale_hits', 'coalesced' or 'refreshes'.
+        :param url: API URL relative to the v3 root.
+        """
+        template = endpoint_template(url)
+        with self._lock:
+            counts = self._cache.setdefault(template, {})
+            counts[outcome] = counts.get(outcome, 0) + 1
+        for hook in self.cache_hooks:
+            hook(outcome, url)
+
+    def stats(self):
+        """
+        Summarize the metrics collected so far.
+
+        :return: Dictionary of endpoint templates to dictionaries with the number of requests, mean, p50 and p99 latency in seconds (p50 and p99 are bucket upper bounds), mean decode time, total bytes, counts of each status code, and counts of each cache outcome.
+        """
+        with self._lock:
+            stats = {}
+            for template in set(self._endpoints) | set(self._cache):
+                endpoint = self._endpoints.get(template) or _EndpointMetrics()
+                stats[template] = {
+                    'requests': endpoint.latency.count,
+                    'mean_seconds': endpoint.latency.sum / endpoint.latency.count if endpoint.latency.count else None,
+                    'p50_seconds': endpoint.latency.quantile(0.5),
+                    'p99_seconds': endpoint.latency.quantile(0.99),
+                    'mean_decode_seconds': endpoint.decode.sum / endpoint.decode.count if endpoint.decode.count else None,
+                    'bytes': endpoint.size.sum,
+                    'statuses': dict(endpoint.statuses),
+                    'cache': dict(endpoint.cache, **self._cache.get(template, {})),
+                }
+            return stats
+
+    def prometheus(self, prefix='tbapy'):
+        """
+        Export the metrics in the Prometheus text exposition format, e.g. to serve from a /metrics endpoint.
+
+        :param prefix: Prefix of the metric names.
+        :return: String.
+        """
+        lines = []
+
+        def histogram(name, help, unit_histograms):
+            lines.append('# HELP %s_%s %s' % (prefix, name, help))
+            lines.append('# TYPE %s_%s histogram' % (prefix, name))
+            for template, values in unit_histograms:
+                seen = 0
+                for bound, count in zip(values.buckets + ('+Inf',), values.counts):
+                    seen += count
+                    lines.append('%s_%s_bucket{endpoint="%s",le="%s"} %d' % (prefix, name, template, bound, seen))
+                lines.append('%s_%s_sum{endpoint="%s"} %r' % (prefix, name, template, values.sum))
+                lines.append('%s_%s_count{endpoint="%s"} %d' % (prefix, name, template, values.count))
+
+        def counter(name, help, label, items):
+            lines.append('# HELP %s_%s %s' % (prefix, name, help))
+            lines.append('# TYPE %s_%s counter' % (prefix, name))
+            for template, counts in items:
+                for value, count in sorted(counts.items(), key=lambda item: str(item[0])):
+                    lines.append('%s_%s{endpoint="%s",%s="%s"} %d' % (prefix, name, template, label, value, count))
+
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            histogram('request_duration_seconds', 'Time to complete read requests.', [(t, e.latency) for t, e in endpoints])
+            histogram('decode_duration_seconds', 'Time to decode read responses.', [(t, e.decode) for t, e in endpoints])
+            histogram('response_size_bytes', 'Size of read response bodies.', [(t, e.size) for t, e in endpoints])
+            counter('responses_total', 'Read responses by status code.', 'status', [(t, e.statuses) for t, e in endpoints])
+            cache = {template: dict(endpoint.cache) for template, endpoint in endpoints}
+            for template, counts in self._cache.items():
+                cache.setdefault(template, {}).update(counts)
+            counter('cache_total', 'Reads by how they were served.', 'outcome', sorted(cache.items()))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """
+        Discard the metrics collected so far.
+        """
+        with self._lock:
+            self._endpoints.clear()
+            self._cache.clear()
@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from datetime import datetime
 
 
@@ -42,9 +43,69 @@ InsightLeaderboard = _model_class('InsightLeaderboard')
 InsightNotable = _model_class('InsightNotable')
 
 class LastModifiedDate:
-    def __init__(self, date_string):
+    def __init__(self, date_string, etag=None):
         self.date_string = date_string
+        self.etag = etag
         self.date = datetime.strptime(date_string, '%a, %d %b %Y %H:%M:%S GMT')
 
     def __bool__(self):
         return False
+
+
+class LazyList(Sequence):
+    """
+    List of models that keeps the decoded response and only wraps an item in its model when it is accessed.
+
+    Slicing and filtering work on the decoded items, so they do not create models either.
+    """
+
+    def __init__(self, raw, model):
+        self._raw = raw
+        self._model = model
+        self._models = None
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LazyList(self._raw[index], self._model)
+        if self._models is None:
+            self._models = [None] * len(self._raw)
+        item = self._models[index]
+        if item is None:
+            item = self._models[index] = self._model(self._raw[index])
+        return item
+
+    def __add__(self, other):
+        if isinstance(other, LazyList) and other._model is self._model:
+            return LazyList(self._raw + other._raw, self._model)
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        if not other:
+            return self
+        return list(other) + list(self)
+
+    def __eq__(self, other):
+        return isinstance(other, (list, LazyList)) and list(self) == list(other)
+
+    def __repr__(self):
+        return '%s(%d %s)' % (self.__class__.__name__, len(self), self._model.__name__)
+
+    def filter(self, function):
+        """
+        Get the items for which a function is true, without creating models for them.
+
+        :param function: Function taking an item in JSON format and returning whether to keep it.
+        :return: LazyList of the matching items.
+        """
+        return LazyList([item for item in self._raw if function(item)], self._model)
+
+    def raw(self):
+        """
+        Get the items as decoded from the response.
+
+        :return: List of items in JSON format.
+        """
+        return self._raw
@@ -0,0 +1,68 @@
+# Per-endpoint-family cache policies for responses kept in memory.
+#
+# TBA resources change at very different rates, so each family of endpoints gets its own freshness window.
+# Within a policy's ttl a response is served from memory; for stale_while_revalidate seconds after that it
+# is still served at once while a background refresh runs; and if a refresh fails, the old response keeps
+# being served for up to stale_if_error seconds past its ttl.
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+
+class CachePolicy:
+    """
+    How long responses of a family of endpoints are served from memory.
+    """
+
+    def __init__(self, ttl, stale_while_revalidate=0, stale_if_error=0):
+        """
+        :param ttl: Seconds a response is fresh and served without a request.
+        :param stale_while_revalidate: Seconds after the ttl during which the old response is returned immediately while it is refreshed in the background.
+        :param stale_if_error: Seconds after the ttl during which the old response is returned if refreshing it fails.
+        """
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+
+    def __repr__(self):
+        return '%s(ttl=%r, stale_while_revalidate=%r, stale_if_error=%r)' % (
+            self.__class__.__name__, self.ttl, self.stale_while_revalidate, self.stale_if_error)
+
+
+DEFAULT_POLICIES = {
+    # Team details, years, robots and media rarely change.
+    'team': CachePolicy(HOUR, DAY, 7 * DAY),
+    # Event details, team lists, rankings, alliances and awards change during an event.
+    'event': CachePolicy(5 * MINUTE, HOUR, DAY),
+    # Match results are posted every few minutes during an event.
+    'match': CachePolicy(MINUTE, 5 * MINUTE, DAY),
+    # District lists, histories and rankings change at most weekly.
+    'district': CachePolicy(HOUR, DAY, 7 * DAY),
+    # Insights are recomputed occasionally.
+    'insights': CachePolicy(DAY, 7 * DAY, 30 * DAY),
+}
+
+
+def endpoint_family(url):
+    """
+    Get the family of an API URL, which decides its cache policy.
+
+    :param url: API URL relative to the v3 root, e.g. 'event/2024casj/matches'.
+    :return: 'match', 'team', 'event', 'district' or 'insights', or None for other endpoints such as status.
+    """
+    parts = url.split('/')
+    if parts[0] == 'match' or 'matches' in parts:
+        return 'match'
+    if parts[-1] in ('status', 'statuses') and parts[0] != 'status':
+        # A team's status at an event changes with the event.
+        return 'event'
+    if parts[0] in ('team', 'teams'):
+        return 'team'
+    if parts[0] in ('event', 'events'):
+        return 'event'
+    if parts[0] in ('district', 'districts'):
+        return 'district'
+    if parts[0] == 'insights':
+        return 'insights'
+    return None
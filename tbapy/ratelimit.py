@@ -0,0 +1,139 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from .exceptions import CircuitOpenError
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RateLimiter:
+    """
+    Client-side request throttling, shareable between clients, threads and asyncio tasks.
+
+    Combines a token bucket that spaces requests out to `rate` per second, retries of 429 and 5xx responses
+    and connection errors with jittered exponential backoff that honors Retry-After, and a circuit breaker
+    that fails fast with CircuitOpenError after `failure_threshold` consecutive failures.
+    """
+
+    def __init__(self, rate=None, burst=1, retries=3, backoff=0.5, max_backoff=60, failure_threshold=5, reset_timeout=30):
+        """
+        Configure throttling.
+
+        :param rate: Requests allowed per second on average, or None for no limit.
+        :param burst: Number of requests that may be made at once before the rate applies.
+        :param retries: Number of times to retry a failed request.
+        :param backoff: Base delay in seconds for the first retry; doubles with each retry.
+        :param max_backoff: Longest delay in seconds between retries.
+        :param failure_threshold: Consecutive failures after which requests fail fast.
+        :param reset_timeout: Seconds to fail fast for before trying requests again.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._failures = 0
+        self._opened_at = None
+        self._stats = {'requests': 0, 'retries': 0, 'throttled_seconds': 0.0, 'circuit_opens': 0}
+
+    def _reserve(self):
+        """
+        Helper method: take a token for a request, checking the circuit breaker first.
+
+        :return: Seconds to wait before making the request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._opened_at is not None and now - self._opened_at < self.reset_timeout:
+                raise CircuitOpenError(self.reset_timeout - (now - self._opened_at))
+            self._stats['requests'] += 1
+            if self.rate is None:
+                return 0
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            delay = max(0, -self._tokens / self.rate)
+            self._stats['throttled_seconds'] += delay
+            return delay
+
+    def wait(self):
+        """
+        Block until a request may be made.
+        """
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def wait_async(self):
+        """
+        Wait without blocking the event loop until a request may be made.
+        """
+        import asyncio
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def retry_delay(self, attempt, response=None):
+        """
+        Record the outcome of a request and decide whether to retry it.
+
+        :param attempt: Number of retries already made for this request.
+        :param response: Response received, or None if the request raised a connection error.
+        :return: Seconds to wait before retrying, or None if the request should not be retried.
+        """
+        status = response.status_code if response is not None else None
+        with self._lock:
+            if status is not None and status not in RETRY_STATUSES:
+                self._failures = 0
+                self._opened_at = None
+                return None
+            if status != 429:
+                self._failures += 1
+                if self._failures >= self.failure_threshold:
+                    if self._opened_at is None:
+                        self._stats['circuit_opens'] += 1
+                    self._opened_at = time.monotonic()
+            if attempt >= self.retries:
+                return None
+            delay = self._retry_after(response)
+            if delay is None:
+                delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+            self._stats['retries'] += 1
+            self._stats['throttled_seconds'] += delay
+            return delay
+
+    @staticmethod
+    def _retry_after(response):
+        """
+        Helper method: read a response's Retry-After header.
+
+        :param response: Response received, or None.
+        :return: Seconds to wait, or None if the header is absent or invalid.
+        """
+        from email.utils import parsedate_to_datetime
+        value = response.headers.get('Retry-After') if response is not None else None
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def stats(self):
+        """
+        Get throttling metrics.
+
+        :return: Dictionary with the number of requests and retries made, total seconds spent waiting for the rate limit or between retries, and number of times the circuit breaker opened.
+        """
+        with self._lock:
+            return dict(self._stats)
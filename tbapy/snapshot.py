@@ -0,0 +1,275 @@
+import copy
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .main import TBA, _batch_error, _batching, _call_options
+from .compression import Compressor, DICTIONARY_SIZE
+from .exceptions import TBAErrorList, NotModifiedException
+from .models import LastModifiedDate
+
+# Read methods fetched for every event of a season.
+EVENT_RESOURCES = ('event', 'event_teams', 'event_matches', 'event_rankings', 'event_awards', 'event_alliances', 'event_oprs')
+# Returned by Snapshot.get() for responses that are not stored, to tell them from stored nulls.
+_MISSING = object()
+
+
+class Snapshot:
+    """
+    Local store of TBA responses, kept in a SQLite file as compressed JSON keyed by API URL.
+
+    Responses are compressed with zstd, or gzip if the zstandard package is not installed. Once a season has been
+    stored, train_dictionary() shrinks it further by compressing every response with a dictionary trained on them.
+
+    Crawling skips responses that are already stored, so an interrupted crawl resumes where it stopped. Each
+    response's Last-Modified date is stored with it, so syncing only downloads responses that have changed.
+    """
+
+    def __init__(self, path, compressor=None):
+        """
+        Open (and create if needed) the snapshot file.
+
+        :param path: Path of the SQLite file.
+        :param compressor: Compressor to store responses with. Defaults to a Compressor using the snapshot's trained dictionary, if any.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS responses '
+                                     '(url TEXT PRIMARY KEY, body BLOB, last_modified TEXT, fetched REAL)')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value BLOB)')
+            row = self._connection.execute("SELECT value FROM settings WHERE name = 'dictionary'").fetchone()
+        self.compressor = compressor or Compressor(dictionary=None if row is None else row[0])
+
+    def get(self, url, default=None):
+        """
+        Get a stored response.
+
+        TBA answers some URLs with null, such as the rankings of an event that has not been played, and that null
+        is stored like any other response; pass a default to tell it from a response that is not stored.
+
+        :param url: API URL relative to the v3 root, e.g. 'event/2024casj/matches'.
+        :param default: Value to return if the response is not stored.
+        :return: Response data in JSON format, or default if it is not stored.
+        """
+        with self._lock:
+            row = self._connection.execute('SELECT body FROM responses WHERE url = ?', (url,)).fetchone()
+        return default if row is None else TBA.json_backend.loads(self.compressor.decompress(row[0]))
+
+    def put(self, url, raw, last_modified=None):
+        """
+        Store a response.
+
+        :param url: API URL relative to the v3 root.
+        :param raw: Response data in JSON format.
+        :param last_modified: Value of the response's Last-Modified header, if any.
+        """
+        body = self.compressor.compress(TBA.json_backend.dumps(raw).encode('utf-8'))
+        with self._lock, self._connection:
+            self._connection.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)', (url, body, last_modified, time.time()))
+
+    def urls(self):
+        """
+        Get the URLs of all stored responses.
+
+        :return: List of API URLs.
+        """
+        with self._lock:
+            return [row[0] for row in self._connection.execute('SELECT url FROM responses ORDER BY url')]
+
+    def last_modified(self):
+        """
+        Get the Last-Modified dates of all stored responses.
+
+        :return: Dictionary of API URLs to Last-Modified header values, or None for responses stored without one.
+        """
+        with self._lock:
+            return dict(self._connection.execute('SELECT url, last_modified FROM responses'))
+
+    def train_dictionary(self, size=DICTIONARY_SIZE, samples=1000):
+        """
+        Train a zstd dictionary on stored responses, and compress every stored response again with it.
+
+        The dictionary is saved in the snapshot and used for responses stored later. It can also be given to a
+        Compressor for caches, since live responses resemble those of the snapshot. Requires zstandard.
+
+        :param size: Maximum size of the dictionary in bytes.
+        :param samples: Number of stored responses to train on.
+        :return: Dictionary as bytes, or None if there were too few responses to train on.
+        """
+        with self._lock:
+            rows = self._connection.execute('SELECT body FROM responses ORDER BY RANDOM() LIMIT ?', (samples,)).fetchall()
+        compressor = Compressor('zstd', self.compressor.level if self.compressor.codec == 'zstd' else None)
+        dictionary = compressor.train([self.compressor.decompress(row[0]) for row in rows], size)
+        if dictionary is None:
+            return None
+        with self._lock, self._connection:
+            bodies = [(compressor.compress(self.compressor.decompress(body)), url)
+                      for url, body in self._connection.execute('SELECT url, body FROM responses')]
+            self._connection.executemany('UPDATE responses SET body = ? WHERE url = ?', bodies)
+            self._connection.execute("INSERT OR REPLACE INTO settings VALUES ('dictionary', ?)", (dictionary,))
+            self.compressor = compressor
+        return dictionary
+
+    def size(self):
+        """
+        Get the total size of stored responses.
+
+        :return: Size in bytes, after compression.
+        """
+        with self._lock:
+            return self._connection.execute('SELECT COALESCE(SUM(LENGTH(body)), 0) FROM responses').fetchone()[0]
+
+    def close(self):
+        self._connection.close()
+
+    def _recorder(self, tba):
+        """
+        Helper method: copy a TBA instance so that its reads are served from this snapshot when stored, and stored when not.
+
+        :param tba: TBA instance to fetch missing responses with.
+        :return: TBA instance.
+        """
+        recorder = copy.copy(tba)
+
+        def get(url):
+            raw = self.get(url, _MISSING)
+            if raw is _MISSING:
+                # Error responses raise rather than being stored, so the crawl reports them and the next one retries them.
+                raw, last_modified = _fetch(tba, url)
+                self.put(url, raw, last_modified)
+            return raw
+
+        recorder._get = get
+        return recorder
+
+    def crawl(self, tba, year, resources=EVENT_RESOURCES, workers=8):
+        """
+        Fetch a season into the snapshot: its events, teams and districts, and the given resources of each event.
+
+        Responses already in the snapshot are not fetched again. A resource that fails is reported rather than stopping the crawl.
+
+        :param tba: TBA instance to fetch with.
+        :param year: Season to fetch.
+        :param resources: Names of read methods to call for each event key.
+        :param workers: Number of responses to fetch at once.
+        :return: List of (method name, key, TBAErrorList) tuples for resources that failed.
+        """
+        recorder = self._recorder(tba)
+        errors = []
+
+        def fetch(resource, key, **kwargs):
+            try:
+                if resource == 'teams':
+                    return recorder.teams(year=key, **kwargs)
+                return getattr(recorder, resource)(key, **kwargs)
+            except Exception as e:
+                errors.append((resource, key, _batch_error(e)))
+                return []
+
+        fetch('teams', year, workers=workers)
+        fetch('events', year, keys=True)
+        events = fetch('events', year)
+        districts = fetch('districts', year)
+
+        def crawl_key(call):
+            fetch(*call)
+
+        calls = [(resource, district['key']) for district in districts for resource in ('district_events', 'district_rankings')]
+        calls += [(resource, event['key']) for event in events for resource in resources]
+        with ThreadPoolExecutor(workers) as executor:
+            list(executor.map(crawl_key, calls))
+        return errors
+
+    def sync(self, tba, year=None, workers=8):
+        """
+        Bring the snapshot up to date.
+
+        Every stored response is requested again with If-Modified-Since, and only responses that changed are
+        downloaded and rewritten. If a season is given, it is then crawled to add responses that did not exist
+        before, such as newly scheduled events.
+
+        :param tba: TBA instance to fetch with.
+        :param year: Season to crawl for new responses, or None to only update stored ones.
+        :param workers: Number of responses to fetch at once.
+        :return: Dictionary of 'added', 'updated' and 'unchanged' lists of API URLs, and an 'errors' list of (API URL, TBAErrorList) tuples, or (method name, key, TBAErrorList) tuples for new resources that failed.
+        """
+        result = {'added': [], 'updated': [], 'unchanged': [], 'errors': []}
+
+        def revalidate(item):
+            url, last_modified = item
+            try:
+                raw, last_modified = _fetch(tba, url, last_modified)
+            except NotModifiedException:
+                result['unchanged'].append(url)
+                return
+            except Exception as e:
+                result['errors'].append((url, _batch_error(e)))
+                return
+            if raw == self.get(url):
+                # Keep the body, but remember the new date so the next sync gets a 304.
+                with self._lock, self._connection:
+                    self._connection.execute('UPDATE responses SET last_modified = ? WHERE url = ?', (last_modified, url))
+                result['unchanged'].append(url)
+            else:
+                self.put(url, raw, last_modified)
+                result['updated'].append(url)
+
+        stored = self.last_modified()
+        with ThreadPoolExecutor(workers) as executor:
+            list(executor.map(revalidate, sorted(stored.items())))
+        if year is not None:
+            result['errors'] += self.crawl(tba, year, workers=workers)
+            result['added'] = [url for url in self.urls() if url not in stored]
+        for urls in (result['updated'], result['unchanged']):
+            urls.sort()
+        return result
+
+
+def _fetch(tba, url, if_modified_since=None):
+    """
+    Helper function: GET a response with a TBA instance along with its Last-Modified date.
+
+    TBA's {"Error": message} responses, such as for an event that was removed, raise TBAErrorList rather than being returned as data.
+
+    :param tba: TBA instance to fetch with.
+    :param url: API URL relative to the v3 root.
+    :param if_modified_since: Last-Modified header value to make the request conditional on, if any.
+    :return: Tuple of the response data in JSON format and its Last-Modified header value, or None if it has none.
+    """
+    options = {'if_modified_since': if_modified_since, 'if_none_match': None, 'last_modified': True,
+               'cache': if_modified_since is None}
+    token = _call_options.set(options)
+    batching = _batching.set(True)
+    try:
+        raw = tba._get(url)
+    finally:
+        _batching.reset(batching)
+        _call_options.reset(token)
+    last_modified = options['last_modified']
+    return raw, last_modified.date_string if isinstance(last_modified, LastModifiedDate) else None
+
+
+class OfflineTBA(TBA):
+    """
+    TBA client that serves read methods from a Snapshot, without using the network.
+    """
+
+    def __init__(self, snapshot, **kwargs):
+        """
+        :param snapshot: Snapshot, or path of a snapshot file.
+        :param kwargs: Options for TBA, e.g. compact=True or lazy=True.
+        """
+        super().__init__('', **kwargs)
+        self.snapshot = snapshot if isinstance(snapshot, Snapshot) else Snapshot(snapshot)
+
+    def _get(self, url):
+        raw = self.snapshot.get(url, _MISSING)
+        if raw is _MISSING:
+            raise TBAErrorList([('snapshot', '%s is not in the snapshot.' % url)])
+        self._detect_errors(raw)
+        # Snapshots made by earlier versions may hold TBA's error responses.
+        if isinstance(raw, dict) and 'Error' in raw:
+            raise TBAErrorList([('Error', raw['Error'])])
+        return raw
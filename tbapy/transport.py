@@ -0,0 +1,190 @@
+# Transports: how TBA sends its HTTP requests.
+#
+# A transport turns a URL and headers into a response exposing status_code, headers, content, request and,
+# for streamed reads, iter_content() and close(), which is what requests returns. The default sends reads
+# through requests with a CacheControl HTTP cache; HTTPXTransport multiplexes requests over HTTP/2
+# connections with httpx. Each transport imports its HTTP library when first used.
+
+import threading
+
+
+class Transport:
+    """
+    Interface of transports.
+
+    `errors` holds the exception types raised for connection failures and timeouts, which are retried.
+    """
+
+    errors = ()
+
+    def get(self, url, headers, cached=True, stream=False):
+        """
+        Send a GET request.
+
+        :param url: Full URL.
+        :param headers: Dictionary of headers.
+        :param cached: Whether the response may be served from, and stored in, an HTTP cache.
+        :param stream: Whether to return before reading the body, which is then read with iter_content().
+        :return: Response object.
+        """
+        raise NotImplementedError
+
+    def post(self, url, data, headers):
+        """
+        Send a POST request.
+
+        :param url: Full URL.
+        :param data: Body string.
+        :param headers: Dictionary of headers.
+        :return: Response object.
+        """
+        raise NotImplementedError
+
+    def invalidate(self, url):
+        """
+        Forget the HTTP cache's response for a URL, if the transport has an HTTP cache.
+
+        :param url: Full URL.
+        """
+
+    def close(self):
+        """
+        Close the transport's connections.
+        """
+
+
+class RequestsTransport(Transport):
+    """
+    Transport using requests, with reads cached by CacheControl. This is the default.
+    """
+
+    def __init__(self, cache_backend=None, pool_size=8):
+        """
+        :param cache_backend: CacheControl cache to store responses in, e.g. SQLiteCache('tba.sqlite'). Defaults to a MemoryCache, created on first use.
+        :param pool_size: Number of connections to keep open per host.
+        """
+        self.cache_backend = cache_backend
+        self.pool_size = pool_size
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    @property
+    def errors(self):
+        import requests
+        return (requests.ConnectionError, requests.Timeout)
+
+    @staticmethod
+    def _session(adapter):
+        """
+        Helper method: create a session that sends all requests through the given adapter.
+
+        :param adapter: Requests transport adapter.
+        :return: Requests Session object.
+        """
+        import requests
+        from .compression import accept_encoding
+        session = requests.Session()
+        session.headers['Accept-Encoding'] = accept_encoding()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    @property
+    def session(self):
+        """
+        Requests session that sends requests through the HTTP cache, created on first use.
+        """
+        with self._lock:
+            if 'cached' not in self._sessions:
+                from cachecontrol import CacheControlAdapter
+                from .cache import DecodingSerializer, MemoryCache
+                if self.cache_backend is None:
+                    self.cache_backend = MemoryCache()
+                self._sessions['cached'] = self._session(CacheControlAdapter(self.cache_backend, serializer=DecodingSerializer(),
+                                                                             pool_maxsize=self.pool_size))
+            return self._sessions['cached']
+
+    @property
+    def uncached_session(self):
+        """
+        Requests session for conditional and streamed reads, which bypass the HTTP cache, created on first use.
+        """
+        with self._lock:
+            if 'uncached' not in self._sessions:
+                from requests.adapters import HTTPAdapter
+                self._sessions['uncached'] = self._session(HTTPAdapter(pool_maxsize=self.pool_size))
+            return self._sessions['uncached']
+
+    def get(self, url, headers, cached=True, stream=False):
+        session = self.session if cached and not stream else self.uncached_session
+        return session.get(url, headers=headers, stream=stream)
+
+    def post(self, url, data, headers):
+        return self.session.post(url, data=data, headers=headers)
+
+    def invalidate(self, url):
+        if self.cache_backend is not None:
+            from cachecontrol.controller import CacheController
+            self.cache_backend.delete(CacheController.cache_url(url))
+
+    def close(self):
+        for session in self._sessions.values():
+            session.close()
+
+
+class _HTTPXResponse:
+    """An httpx response, with the parts of the requests interface that TBA uses."""
+
+    def __init__(self, response):
+        self.response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.request = response.request
+
+    @property
+    def content(self):
+        return self.response.content
+
+    def iter_content(self, chunk_size):
+        return self.response.iter_bytes(chunk_size)
+
+    def close(self):
+        self.response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class HTTPXTransport(Transport):
+    """
+    Transport using httpx, which can multiplex many concurrent requests over one HTTP/2 connection.
+
+    There is no HTTP cache, so pair it with micro_cache_ttl or cache policies to avoid repeating reads.
+    Requires httpx, and h2 for HTTP/2: `pip3 install tbapy[http2]`.
+    """
+
+    def __init__(self, http2=True, max_connections=100, timeout=30, client=None):
+        """
+        :param http2: Negotiate HTTP/2 with servers that support it.
+        :param max_connections: Maximum number of connections to keep open.
+        :param timeout: Request timeout in seconds.
+        :param client: Optional preconfigured httpx.Client to use instead of creating one.
+        """
+        import httpx
+        from .compression import accept_encoding
+        self.errors = (httpx.TransportError,)
+        self.client = client or httpx.Client(http2=http2, limits=httpx.Limits(max_connections=max_connections), timeout=timeout,
+                                             headers={'Accept-Encoding': accept_encoding()})
+
+    def get(self, url, headers, cached=True, stream=False):
+        request = self.client.build_request('GET', url, headers=headers)
+        return _HTTPXResponse(self.client.send(request, stream=stream))
+
+    def post(self, url, data, headers):
+        return _HTTPXResponse(self.client.post(url, content=data.encode('utf-8'), headers=headers))
+
+    def close(self):
+        self.client.close()
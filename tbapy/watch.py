@@ -0,0 +1,96 @@
+import heapq
+import threading
+import time
+from .models import LastModifiedDate
+
+
+class Watcher:
+    """
+    Poll read methods with conditional requests and yield their new values as they change.
+
+    Each resource remembers the Last-Modified date and ETag of its latest response, so polls of an unchanged
+    resource are answered with 304 Not Modified and yield nothing. A resource's poll interval shrinks by a
+    factor of `backoff` whenever it changes and grows by the same factor whenever it does not, staying between
+    min_interval and max_interval. The first poll of each resource yields its current value.
+
+    A poll that fails, for example because TBA is down, backs off like an unchanged one and does not stop the
+    other resources; `errors` maps each resource whose latest poll failed to the exception it raised.
+    """
+
+    def __init__(self, tba, resources, min_interval=5, max_interval=300, backoff=2):
+        """
+        Set up polling state for each resource.
+
+        :param tba: TBA instance to poll with.
+        :param resources: Read method calls to watch, each a tuple of the method name followed by its arguments.
+        :param min_interval: Shortest time in seconds between polls of one resource.
+        :param max_interval: Longest time in seconds between polls of one resource.
+        :param backoff: Factor by which a resource's poll interval changes after each poll.
+        """
+        self.tba = tba
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.resources = [(resource,) if isinstance(resource, str) else tuple(resource) for resource in resources]
+        self.intervals = {resource: min_interval for resource in self.resources}
+        self.validators = {}
+        self.errors = {}
+        self._stopped = threading.Event()
+
+    def __iter__(self):
+        schedule = [(time.monotonic(), i, resource) for i, resource in enumerate(self.resources)]
+        heapq.heapify(schedule)
+        while schedule:
+            if self._stopped.wait(max(0, schedule[0][0] - time.monotonic())):
+                return
+            now = time.monotonic()
+            due = []
+            while schedule and schedule[0][0] <= now:
+                due.append(heapq.heappop(schedule))
+            for (_, i, resource), (changed, value) in zip(due, self.tba.executor.map(self.poll, [entry[2] for entry in due])):
+                heapq.heappush(schedule, (time.monotonic() + self.intervals[resource], i, resource))
+                if changed and self.running:
+                    yield resource, value
+
+    @property
+    def running(self):
+        """
+        Whether the watcher has not been stopped.
+        """
+        return not self._stopped.is_set()
+
+    def stop(self):
+        """
+        Stop watching. A wait for the next poll ends at once; polls being made are finished, but their values are not yielded.
+        """
+        self._stopped.set()
+
+    def poll(self, resource):
+        """
+        Poll a single resource once and update its interval.
+
+        :param resource: Tuple of the method name followed by its arguments.
+        :return: Tuple of whether the resource changed and its new value, or (False, None) if it is unchanged or the poll failed.
+        """
+        name, *args = resource
+        kwargs = {'last_modified': True}
+        validator = self.validators.get(resource)
+        if validator is not None:
+            kwargs.update(if_modified_since=validator.date, if_none_match=validator.etag)
+
+        try:
+            result = getattr(self.tba, name)(*args, **kwargs)
+        except Exception as e:
+            self.errors[resource] = e
+            self.intervals[resource] = min(self.max_interval, self.intervals[resource] * self.backoff)
+            return False, None
+        self.errors.pop(resource, None)
+        if isinstance(result, LastModifiedDate):
+            self.intervals[resource] = min(self.max_interval, self.intervals[resource] * self.backoff)
+            return False, None
+
+        value, last_modified = result
+        if isinstance(last_modified, LastModifiedDate):
+            self.validators[resource] = last_modified
+        self.intervals[resource] = max(self.min_interval, self.intervals[resource] / self.backoff)
+        return True, value
@@ -0,0 +1,294 @@
+# Receiver of TBA webhooks.
+#
+# TBA POSTs a JSON body of {"message_type": ..., "message_data": {...}} to a registered URL when something
+# happens at an event, signed with the webhook's secret in the X-TBA-HMAC header (a hex HMAC-SHA256 of the
+# body). WebhookReceiver is a WSGI and ASGI app that checks the signature, decodes the message into models,
+# brings a TBA instance's caches up to date and hands the message to subscribers, so clients can react to
+# matches being scored without polling.
+
+import hashlib
+import hmac
+import json
+import threading
+
+from . import models as _models
+
+# Read URLs whose responses may change when a match of an event is scored, beyond the match's own.
+_EVENT_MATCH_URLS = ('event/%s/matches/simple', 'event/%s/matches/keys', 'event/%s/rankings', 'event/%s/oprs', 'event/%s/predictions',
+                     'event/%s/insights', 'event/%s/teams/statuses', 'event/%s/district_points')
+_TEAM_MATCH_URLS = ('team/%s/event/%s/matches', 'team/%s/event/%s/matches/simple', 'team/%s/event/%s/matches/keys', 'team/%s/event/%s/status')
+_STATUS_LINES = {200: '200 OK', 400: '400 Bad Request', 401: '401 Unauthorized', 405: '405 Method Not Allowed'}
+
+
+class WebhookMessage:
+    """
+    A webhook message from TBA.
+
+    `type` is the message type, such as 'match_score', 'upcoming_match' or 'alliance_selection', and `data` its
+    data in JSON format. Where the data includes them, `match`, `event` and `awards` hold it decoded into models,
+    and `event_key` and `match_key` the keys it concerns; otherwise they are None.
+    """
+
+    def __init__(self, message_type, data, models=_models):
+        """
+        :param message_type: Message type string.
+        :param data: Message data dictionary.
+        :param models: Module of model classes to decode with.
+        """
+        self.type = message_type
+        self.data = data
+        self.match = models.Match(data['match']) if isinstance(data.get('match'), dict) else None
+        self.event = models.Event(data['event']) if isinstance(data.get('event'), dict) else None
+        self.awards = [models.Award(award) for award in data['awards']] if isinstance(data.get('awards'), list) else None
+        self.event_key = data.get('event_key')
+        self.match_key = data.get('match_key')
+        if self.match is not None:
+            self.event_key = self.event_key or data['match'].get('event_key')
+            self.match_key = self.match_key or data['match'].get('key')
+        if self.event is not None:
+            self.event_key = self.event_key or data['event'].get('key')
+
+    def __repr__(self):
+        return '%s(%s, %s)' % (self.__class__.__name__, self.type, self.match_key or self.event_key)
+
+
+class WebhookReceiver:
+    """
+    WSGI and ASGI app receiving TBA webhooks.
+
+    Messages whose signature does not match the secret are rejected. Accepted messages update the caches of a
+    TBA instance, if given: scored matches are patched into responses kept in memory by cache policies or
+    micro_cache_ttl, and responses that the message makes out of date are forgotten. Each message is then passed
+    to the callbacks subscribed to its type and put on the queue, if given.
+
+    Use the receiver itself as a WSGI app, or receiver.asgi as an ASGI app. Callbacks run in the server's request
+    handler, which for ASGI is the event loop, so they should return quickly.
+    """
+
+    def __init__(self, secret, tba=None, queue=None, loop=None):
+        """
+        :param secret: Webhook secret shown by TBA when the webhook was registered.
+        :param tba: TBA instance whose caches to keep up to date, and whose models to decode messages with.
+        :param queue: Queue to put every accepted WebhookMessage on, such as a queue.Queue or an asyncio.Queue.
+        :param loop: Event loop of an asyncio.Queue given as queue, for putting messages on it from WSGI server threads.
+        """
+        self.secret = secret.encode('utf-8')
+        self.tba = tba
+        self.queue = queue
+        self.loop = loop
+        self.verification_key = None
+        self.errors = []
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback, *message_types):
+        """
+        Call a function with every accepted message of the given types.
+
+        :param callback: Function taking a WebhookMessage. Exceptions it raises are added to `errors` as (message, exception) tuples.
+        :param message_types: Message types to call it for, such as 'match_score'. All types if none are given.
+        """
+        with self._lock:
+            self._subscribers.append((callback, message_types))
+
+    def unsubscribe(self, callback):
+        """
+        Stop calling a function subscribed with subscribe().
+
+        :param callback: Function to stop calling.
+        """
+        with self._lock:
+            self._subscribers = [subscriber for subscriber in self._subscribers if subscriber[0] != callback]
+
+    def verify(self, body, signature):
+        """
+        Check that a message was signed with the webhook's secret.
+
+        :param body: Request body bytes.
+        :param signature: Value of the X-TBA-HMAC header.
+        :return: Whether the signature is valid.
+        """
+        expected = hmac.new(self.secret, body, hashlib.sha256).hexdigest()
+        return signature is not None and hmac.compare_digest(expected, signature)
+
+    def handle(self, body, signature):
+        """
+        Verify, decode and deliver a message. This is what the WSGI and ASGI apps do with each POST.
+
+        :param body: Request body bytes.
+        :param signature: Value of the X-TBA-HMAC header, or None if it is missing.
+        :return: Tuple of the HTTP status code to respond with and the WebhookMessage, or None if it was rejected.
+        """
+        if not self.verify(body, signature):
+            return 401, None
+        try:
+            payload = json.loads(body)
+            message = WebhookMessage(payload['message_type'], payload.get('message_data') or {},
+                                     self.tba.models if self.tba is not None else _models)
+            if self.tba is not None:
+                # Data of an unexpected shape, such as awards that are not dictionaries, is rejected like a malformed body.
+                update_cache(self.tba, message)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return 400, None
+
+        if message.type == 'verification':
+            self.verification_key = message.data.get('verification_key')
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback, message_types in subscribers:
+            if not message_types or message.type in message_types:
+                try:
+                    callback(message)
+                except Exception as e:
+                    self.errors.append((message, e))
+        if self.queue is not None:
+            if self.loop is not None:
+                self.loop.call_soon_threadsafe(self.queue.put_nowait, message)
+            else:
+                self.queue.put_nowait(message)
+        return 200, message
+
+    def __call__(self, environ, start_response):
+        if environ['REQUEST_METHOD'] != 'POST':
+            status = 405
+        else:
+            try:
+                length = int(environ.get('CONTENT_LENGTH') or 0)
+            except ValueError:
+                length = 0
+            status = self.handle(environ['wsgi.input'].read(length), environ.get('HTTP_X_TBA_HMAC'))[0]
+        start_response(_STATUS_LINES[status], [('Content-Type', 'text/plain'), ('Content-Length', '0')])
+        return [b'']
+
+    async def asgi(self, scope, receive, send):
+        """
+        ASGI app receiving webhooks.
+        """
+        if scope['type'] == 'lifespan':
+            while True:
+                event = await receive()
+                if event['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif event['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        if scope['type'] != 'http':
+            return
+        if scope['method'] != 'POST':
+            status = 405
+        else:
+            body = b''
+            while True:
+                event = await receive()
+                body += event.get('body', b'')
+                if not event.get('more_body'):
+                    break
+            signature = dict(scope['headers']).get(b'x-tba-hmac')
+            status = self.handle(body, None if signature is None else signature.decode('latin-1'))[0]
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', b'text/plain'), (b'content-length', b'0')]})
+        await send({'type': 'http.response.body', 'body': b''})
+
+
+
+def _replace_match(match):
+    """
+    Helper function: make a function replacing a match in a list of matches.
+
+    :param match: Match dictionary.
+    :return: Function taking a list of match dictionaries and returning a new list, or None if the match is not in it.
+    """
+    def replace(matches):
+        keys = [item.get('key') for item in matches]
+        if match['key'] not in keys:
+            return None
+        return [match if key == match['key'] else item for key, item in zip(keys, matches)]
+    return replace
+
+
+def _update_match(match_key, fields):
+    """
+    Helper function: make a function updating fields of a match, alone or in a list of matches.
+
+    :param match_key: Key of the match to update.
+    :param fields: Dictionary of fields to set.
+    :return: Function taking a match dictionary or list of match dictionaries and returning an updated copy.
+    """
+    def update(raw):
+        if isinstance(raw, dict):
+            return dict(raw, **fields)
+        return [dict(item, **fields) if item.get('key') == match_key else item for item in raw]
+    return update
+
+
+def update_cache(tba, message):
+    """
+    Bring a TBA instance's caches up to date with a webhook message.
+
+    Matches in the message are patched into responses kept in memory; other responses it makes out of date are forgotten.
+
+    :param tba: TBA instance.
+    :param message: WebhookMessage.
+    """
+    event = message.event_key
+    if message.type in ('match_score', 'match_video') and message.match is not None and message.data['match'].get('key'):
+        match = message.data['match']
+        tba.patch_cache('match/%s' % match['key'], lambda raw: match)
+        tba.invalidate('match/%s/simple' % match['key'])
+        if event:
+            tba.patch_cache('event/%s/matches' % event, _replace_match(match))
+            alliances = match.get('alliances')
+            teams = [team for alliance in (alliances.values() if isinstance(alliances, dict) else [])
+                     if isinstance(alliance, dict) for team in alliance.get('team_keys') or []]
+            _invalidate_event_matches(tba, event, teams)
+    elif message.type == 'upcoming_match' and message.match_key:
+        # Matches call their scheduled time 'time'.
+        fields = {field: message.data[name] for name, field in (('predicted_time', 'predicted_time'), ('scheduled_time', 'time'))
+                  if name in message.data}
+        update = _update_match(message.match_key, fields)
+        tba.patch_cache('match/%s' % message.match_key, update)
+        tba.invalidate('match/%s/simple' % message.match_key)
+        if event:
+            tba.patch_cache('event/%s/matches' % event, update)
+            tba.invalidate('event/%s/matches/simple' % event)
+            for team in message.data.get('team_keys') or []:
+                for url in _TEAM_MATCH_URLS[:2]:
+                    tba.invalidate(url % (team, event))
+    elif message.type == 'schedule_updated' and event:
+        tba.invalidate('event/%s/matches' % event)
+        _invalidate_event_matches(tba, event, [])
+    elif message.type == 'alliance_selection' and event:
+        for url in ('event/%s/alliances', 'event/%s/teams/statuses'):
+            tba.invalidate(url % event)
+        if message.event is not None:
+            tba.patch_cache('event/%s' % event, lambda raw: message.data['event'])
+        else:
+            tba.invalidate('event/%s' % event)
+    elif message.type == 'awards_posted' and event:
+        if message.awards is not None:
+            tba.patch_cache('event/%s/awards' % event, lambda raw: message.data['awards'])
+            for award in message.data['awards']:
+                for recipient in award.get('recipient_list') or []:
+                    if recipient.get('team_key'):
+                        tba.invalidate('team/%s/event/%s/awards' % (recipient['team_key'], event))
+        else:
+            tba.invalidate('event/%s/awards' % event)
+    elif message.type == 'district_points_updated' and message.data.get('district_key'):
+        tba.invalidate('district/%s/rankings' % message.data['district_key'])
+
+
+def _invalidate_event_matches(tba, event, teams):
+    """
+    Helper function: forget the responses of an event that change when its matches do.
+
+    :param tba: TBA instance.
+    :param event: Event key.
+    :param teams: Team keys of the matches that changed.
+    """
+    for url in _EVENT_MATCH_URLS:
+        tba.invalidate(url % event)
+    for team in teams:
+        for url in _TEAM_MATCH_URLS:
+            tba.invalidate(url % (team, event))
+        for url in ('team/%s/matches/%s', 'team/%s/matches/%s/simple', 'team/%s/matches/%s/keys'):
+            tba.invalidate(url % (team, event[:4]))
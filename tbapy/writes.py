@@ -0,0 +1,293 @@
+# Write-behind queue for the trusted write API.
+#
+# Updates are queued per event and endpoint and merged while they wait, so a burst of calls during live
+# scoring becomes one request. When an update is sent it is first diffed against what was last sent
+# successfully, so only changed matches, info fields and videos go over the wire, and unchanged full-state
+# updates (rankings, alliances, awards, team lists) are skipped. Updates are sent in the order they were
+# queued; a match deletion is never merged across, so updates queued after it are sent after it.
+
+import copy
+import threading
+import time
+
+from .ratelimit import RETRY_STATUSES
+
+# Endpoints whose updates replace the event's previous data, so a new update supersedes a pending one.
+_REPLACED = ('update_event_alliances', 'update_event_awards', 'update_event_rankings', 'update_event_team_list')
+
+
+def _match_key(match):
+    """
+    Helper function: get the partial key of a match in trusted API format, such as 'qm12' or 'sf2m1'.
+
+    :param match: Match dictionary.
+    :return: String.
+    """
+    if match.get('comp_level') == 'qm':
+        return 'qm%s' % match.get('match_number')
+    return '%s%sm%s' % (match.get('comp_level'), match.get('set_number'), match.get('match_number'))
+
+
+class _Update:
+    """A pending update of one endpoint of one event."""
+
+    def __init__(self, credentials, method, data):
+        self.credentials = credentials
+        self.method = method
+        self.data = data
+
+
+class WriteQueue:
+    """
+    Queues trusted API writes and sends them in the background, merging and diffing them first.
+
+    Offers the same write methods as TBA, which return immediately. Credentials and event key are taken from
+    the TBA instance when each update is queued, so update_trusted() may be called between updates.
+    """
+
+    def __init__(self, tba, delay=0.5, retries=5, backoff=1, max_backoff=30):
+        """
+        :param tba: TBA instance with trusted API credentials to send updates with.
+        :param delay: Seconds to wait after an update is queued before sending, so that updates made in quick succession are merged.
+        :param retries: Number of times to retry an update that fails with a 429 or 5xx response or a connection error.
+        :param backoff: Delay in seconds before the first retry; doubles with each retry.
+        :param max_backoff: Longest delay in seconds between retries.
+        """
+        self.tba = tba
+        self.delay = delay
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.errors = []
+        self._pending = []
+        self._sent = {}
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._queued = threading.Condition(self._lock)
+        self._worker = None
+        self._running = True
+
+    def _queue(self, method, data, merge):
+        """
+        Helper method: queue an update, merging it into a pending update of the same endpoint and event if possible.
+
+        :param method: Name of the TBA write method to send the update with.
+        :param data: Data of the update.
+        :param merge: Function taking the pending data and the new data and returning their merge, or None to never merge.
+        """
+        credentials = (self.tba.auth_id, self.tba.auth_secret, self.tba.event_key)
+        with self._lock:
+            for update in reversed(self._pending):
+                if update.credentials[2] != credentials[2]:
+                    continue
+                if update.method == 'delete_event_matches':
+                    break
+                if update.method == method and update.credentials == credentials and merge is not None:
+                    update.data = merge(update.data, data)
+                    return
+            self._pending.append(_Update(credentials, method, data))
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+            self._queued.notify()
+
+    def update_event_info(self, data):
+        """
+        Queue an update of an event's info. Only fields that differ from those last sent are sent.
+
+        :param data: Dictionary of data to update the event with.
+        """
+        self._queue('update_event_info', dict(data), lambda pending, new: dict(pending, **new))
+
+    def update_event_alliances(self, data):
+        """
+        Queue an update of an event's alliances. It is skipped if they are the same as those last sent.
+
+        :param data: List of lists of alliances in frc#### string format.
+        """
+        self._queue('update_event_alliances', copy.deepcopy(data), lambda pending, new: new)
+
+    def update_event_awards(self, data):
+        """
+        Queue an update of an event's awards. It is skipped if they are the same as those last sent.
+
+        :param data: List of dictionaries of award winners, as for TBA.update_event_awards().
+        """
+        self._queue('update_event_awards', copy.deepcopy(data), lambda pending, new: new)
+
+    def update_event_matches(self, data):
+        """
+        Queue an update of an event's matches. Only matches that differ from those last sent are sent.
+
+        :param data: List of match dictionaries, as for TBA.update_event_matches().
+        """
+        self._queue('update_event_matches', {_match_key(match): copy.deepcopy(match) for match in data},
+                    lambda pending, new: dict(pending, **new))
+
+    def delete_event_matches(self, data=None):
+        """
+        Queue a deletion of an event's matches. Updates queued before it are sent before it, and those queued after it after it.
+
+        :param data: List of partial match keys to delete, or None to delete all matches.
+        """
+        self._queue('delete_event_matches', None if data is None else list(data), None)
+
+    def update_event_rankings(self, data):
+        """
+        Queue an update of an event's rankings. It is skipped if they are the same as those last sent.
+
+        :param data: Dictionary of breakdowns and rankings, as for TBA.update_event_rankings().
+        """
+        self._queue('update_event_rankings', copy.deepcopy(data), lambda pending, new: new)
+
+    def update_event_team_list(self, data):
+        """
+        Queue an update of an event's team list. It is skipped if it is the same as the one last sent.
+
+        :param data: List of team keys in frc#### string format.
+        """
+        self._queue('update_event_team_list', list(data), lambda pending, new: new)
+
+    def add_match_videos(self, data):
+        """
+        Queue match videos to add. Videos already sent for the same match are not sent again.
+
+        :param data: Dictionary of partial match keys to youtube video ids.
+        """
+        self._queue('add_match_videos', dict(data), lambda pending, new: dict(pending, **new))
+
+    def add_event_videos(self, data):
+        """
+        Queue event videos to add. Videos already sent are not sent again.
+
+        :param data: List of youtube video ids.
+        """
+        self._queue('add_event_videos', list(data), lambda pending, new: pending + [video for video in new if video not in pending])
+
+    def _changes(self, update):
+        """
+        Helper method: diff an update against what was last sent for its endpoint and event.
+
+        :param update: _Update object.
+        :return: Data to send, or None if nothing changed.
+        """
+        sent = self._sent.get((update.credentials[2], update.method))
+        if sent is None:
+            changes = update.data
+        elif update.method in _REPLACED:
+            changes = None if update.data == sent else update.data
+        elif update.method == 'add_event_videos':
+            changes = [video for video in update.data if video not in sent]
+        else:
+            changes = {key: value for key, value in update.data.items() if sent.get(key) != value}
+        if not changes:
+            return None
+        return list(changes.values()) if update.method == 'update_event_matches' else changes
+
+    def _record(self, update):
+        """
+        Helper method: remember the data of an update that was sent successfully.
+
+        :param update: _Update object.
+        """
+        event = update.credentials[2]
+        if update.method == 'delete_event_matches':
+            matches = self._sent.get((event, 'update_event_matches'), {})
+            for key in list(matches) if update.data is None else update.data:
+                matches.pop(key, None)
+        elif update.method in _REPLACED:
+            self._sent[(event, update.method)] = update.data
+        elif update.method == 'add_event_videos':
+            self._sent.setdefault((event, update.method), set()).update(update.data)
+        else:
+            self._sent.setdefault((event, update.method), {}).update(update.data)
+
+    def _send(self, update):
+        """
+        Helper method: send an update, retrying it if it fails in a way that may be temporary.
+
+        :param update: _Update object.
+        :return: None if the update was sent or had no changes, otherwise the exception or Response object it failed with.
+        """
+        if update.method == 'delete_event_matches':
+            changes = update.data
+        else:
+            changes = self._changes(update)
+            if changes is None:
+                return None
+        client = copy.copy(self.tba)
+        client.update_trusted(*update.credentials)
+        attempt = 0
+        while True:
+            try:
+                response = getattr(client, update.method)(changes)
+            except client.transport.errors as e:
+                failure, retry = e, True
+            else:
+                if response.status_code < 400:
+                    self._record(update)
+                    return None
+                failure, retry = response, response.status_code in RETRY_STATUSES
+            if not retry or attempt >= self.retries:
+                return failure
+            time.sleep(min(self.max_backoff, self.backoff * 2 ** attempt))
+            attempt += 1
+
+    def _drain(self):
+        """
+        Helper method: send every pending update in order.
+
+        :return: List of (method name, event key, exception or Response object) tuples for updates that failed.
+        """
+        failures = []
+        with self._send_lock:
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        break
+                    update = self._pending.pop(0)
+                try:
+                    failure = self._send(update)
+                except Exception as e:
+                    # Such as a TypeError from a JSON backend that cannot encode the data; it would fail again if retried.
+                    failure = e
+                if failure is not None:
+                    failures.append((update.method, update.credentials[2], failure))
+            self.errors += failures
+        return failures
+
+    def _run(self):
+        while self._running:
+            with self._lock:
+                while self._running and not self._pending:
+                    self._queued.wait()
+            time.sleep(self.delay)
+            self._drain()
+
+    def flush(self):
+        """
+        Send every pending update now, waiting until they are sent.
+
+        :return: List of (method name, event key, exception or Response object) tuples for updates that failed.
+        """
+        return self._drain()
+
+    def pending(self):
+        """
+        Get the number of updates waiting to be sent.
+
+        :return: Integer.
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def close(self):
+        """
+        Send every pending update and stop the background thread.
+
+        :return: List of updates that failed, as for flush().
+        """
+        with self._lock:
+            self._running = False
+            self._queued.notify()
+        return self._drain()
@@ -0,0 +1,143 @@
+# Runs the same reads, conditional reads, streamed reads and trusted writes through each transport, and the same
+# reads through AsyncTBA, against the local mock of the TBA API in benchmarks/mock_server.py.
+#
+# Usage: python -m pytest tests
+
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+# Test the tbapy in this checkout, and import the mock server from the benchmarks.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'benchmarks')]
+
+import tbapy
+from mock_server import LAST_MODIFIED, MockTBA, synthetic_fixtures
+
+EVENT = '2024e0'
+TRANSPORTS = {'requests': lambda: tbapy.RequestsTransport(), 'httpx': lambda: pytest.importorskip('httpx') and tbapy.HTTPXTransport()}
+
+
+@pytest.fixture(scope='module')
+def mock():
+    mock = MockTBA(synthetic_fixtures(events=2, matches=12, team_pages=1))
+    mock.start()
+    yield mock
+    mock.stop()
+
+
+@pytest.fixture(params=list(TRANSPORTS))
+def tba(request, mock):
+    tba = tbapy.TBA('key', transport=TRANSPORTS[request.param]())
+    tba.READ_URL_PRE = mock.url
+    tba.WRITE_URL_PRE = mock.url.replace('/api/v3/', '/api/trusted/v1/')
+    yield tba
+    tba.transport.close()
+
+
+def test_read(tba):
+    assert tba.status().current_season == 2024
+    assert tba.team(7).nickname == 'Team 7'
+    matches = tba.event_matches(EVENT)
+    assert [match.key for match in matches] == ['%s_qm%d' % (EVENT, number) for number in range(1, 13)]
+    assert matches[0].alliances['red']['team_keys'] == ['frc8', 'frc21', 'frc34']
+
+
+def test_read_pages(tba):
+    teams = tba.teams()
+    assert len(teams) == 500 and teams[-1].key == 'frc499'
+
+
+def test_repeated_read(tba):
+    assert tba.event_matches(EVENT) == tba.event_matches(EVENT)
+
+
+def test_conditional_read(tba):
+    matches, last_modified = tba.event_matches(EVENT, last_modified=True)
+    assert len(matches) == 12
+    assert last_modified.date_string == LAST_MODIFIED and last_modified.etag
+
+    unchanged = tba.event_matches(EVENT, if_modified_since=last_modified.date)
+    assert not unchanged and unchanged.date == last_modified.date
+    assert not tba.event_matches(EVENT, if_none_match=last_modified.etag)
+    with pytest.raises(tbapy.NotModifiedException):
+        tba.event_matches(EVENT, if_none_match=last_modified.etag, silent=False)
+    assert len(tba.event_matches(EVENT, if_modified_since=datetime(2024, 5, 1))) == 12
+
+
+def test_many(tba):
+    teams = tba.many('team', [7, 8, 99999])
+    assert [team.key for team in teams[:2]] == ['frc7', 'frc8']
+    assert isinstance(teams[2], tbapy.TBAErrorList)
+
+
+def test_stream(tba):
+    streamed = list(tba.stream('event_matches', EVENT))
+    assert [match.key for match in streamed] == [match.key for match in tba.event_matches(EVENT)]
+
+
+def test_post(tba, mock):
+    tba.update_trusted('id', 'secret', EVENT)
+    response = tba.update_event_info({'first_event_code': 'e0'})
+    assert response.status_code == 200
+
+    path, headers, body = mock.posts[-1]
+    assert path == '/api/trusted/v1/event/%s/info/update' % EVENT
+    assert json.loads(body) == {'first_event_code': 'e0'}
+    assert headers['X-TBA-Auth-Id'] == 'id'
+    assert headers['X-TBA-Auth-Sig'] == hashlib.md5(b'secret' + path.encode('utf-8') + body).hexdigest()
+
+
+def run_async(mock, test):
+    """
+    Run a coroutine function with an AsyncTBA reading from the mock server.
+    """
+    pytest.importorskip('httpx')
+
+    async def main():
+        async with tbapy.AsyncTBA('key') as tba:
+            tba.READ_URL_PRE = mock.url
+            await test(tba)
+
+    asyncio.run(main())
+
+
+def test_async_read(mock):
+    async def test(tba):
+        assert (await tba.status()).current_season == 2024
+        assert (await tba.team(7)).nickname == 'Team 7'
+        matches = await tba.event_matches(EVENT)
+        assert [match.key for match in matches] == ['%s_qm%d' % (EVENT, number) for number in range(1, 13)]
+        assert len(await tba.teams()) == 500
+
+    run_async(mock, test)
+
+
+def test_async_conditional_read(mock):
+    async def test(tba):
+        matches, last_modified = await tba.event_matches(EVENT, last_modified=True)
+        assert len(matches) == 12
+        assert last_modified.date_string == LAST_MODIFIED and last_modified.etag
+
+        unchanged = await tba.event_matches(EVENT, if_modified_since=last_modified.date)
+        assert not unchanged and unchanged.date == last_modified.date
+        assert not await tba.event_matches(EVENT, if_none_match=last_modified.etag)
+        assert len(await tba.event_matches(EVENT, if_modified_since=datetime(2024, 5, 1))) == 12
+
+    run_async(mock, test)
+
+
+def test_async_many(mock):
+    async def test(tba):
+        teams = await tba.many('team', [7, 8, 99999])
+        assert [team.key for team in teams[:2]] == ['frc7', 'frc8']
+        assert isinstance(teams[2], tbapy.TBAErrorList)
+        matches = await tba.many('event_matches', ['2024e0', '2024e1'])
+        assert [len(event_matches) for event_matches in matches] == [12, 12]
+
+    run_async(mock, test)